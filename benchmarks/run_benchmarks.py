@@ -0,0 +1,201 @@
+import argparse
+import copy
+import json
+import platform
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.synthetic import (
+    synthetic_distance_frame,
+    synthetic_trips,
+    synthetic_zone_tables,
+    train_synthetic_model,
+)
+from src.dispatch import resources
+from src.dispatch.simulator import (
+    DispatchSimulator,
+    Order,
+    generate_fake_orders,
+    initialize_couriers,
+    predict_eta,
+    predict_eta_batch,
+)
+
+ZONE_IDS = list(range(1, 264))
+DEFAULT_FLEET_SIZES = [5, 50, 500, 2000, 10000]
+# Each result reports one headline metric; "higher" metrics regress when they drop.
+DIRECTIONS = {"us_per_call": "lower", "orders_per_sec": "higher", "rows_per_sec": "higher", "peak_rss_mb": "lower"}
+
+
+def configure_offline(seed: int = 0) -> None:
+    zone_tables = synthetic_zone_tables(seed)
+    resources.configure(model=train_synthetic_model(zone_tables, seed=seed), zone_tables=zone_tables)
+
+
+def time_calls(fn, repeats: int) -> np.ndarray:
+    fn()  # warm-up
+    samples = np.empty(repeats)
+    for i in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples[i] = time.perf_counter() - started
+    return samples * 1e6
+
+
+def latency_result(samples_us: np.ndarray) -> dict:
+    return {
+        "metric": "us_per_call",
+        "value": float(np.median(samples_us)),
+        "p99_us": float(np.percentile(samples_us, 99)),
+        "calls": len(samples_us),
+    }
+
+
+def bench_prediction(repeats: int) -> dict:
+    order = Order(order_id=0, timestamp=3600.0, pickup_zone=132, dropoff_zone=236)
+    zones_50 = np.array(ZONE_IDS[:50])
+    return {
+        "predict_eta_single": latency_result(time_calls(lambda: predict_eta(order, order.timestamp, None), repeats)),
+        "predict_eta_batch_50": latency_result(
+            time_calls(lambda: predict_eta_batch(order, order.timestamp, zones_50), repeats)
+        ),
+    }
+
+
+def bench_dispatch(fleet_sizes, num_orders: int, seed: int) -> dict:
+    results = {}
+    for fleet_size in fleet_sizes:
+        rng = random.Random(seed)
+        couriers = initialize_couriers(fleet_size, ZONE_IDS, rng=rng)
+        # Keep the fleet under load: roughly one new order per courier-trip.
+        orders = generate_fake_orders(num_orders, ZONE_IDS, interval=1800.0 / fleet_size, rng=rng)
+        for engine, suffix in (("event", ""), ("columnar", "_columnar")):
+            sim = DispatchSimulator(copy.deepcopy(couriers), orders, engine=engine)
+            sim.run()
+            results[f"dispatch_{fleet_size}_couriers{suffix}"] = {
+                "metric": "orders_per_sec",
+                "value": num_orders / sim.wall_clock_sec,
+                "wall_clock_sec": sim.wall_clock_sec,
+                "orders": num_orders,
+                "assigned_orders": len(sim.assignments),
+            }
+    return results
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_feature_pipeline(num_rows: int, seed: int) -> dict:
+    # Runs in a fresh process so peak RSS belongs to this benchmark alone.
+    from src.features.encode_speed import target_encode_kfold
+    from src.features.make_features import build_month_features
+
+    trips = synthetic_trips(num_rows, seed)
+    distances = synthetic_distance_frame(synthetic_zone_tables(seed))
+    baseline_rss = _peak_rss_mb()
+
+    started = time.perf_counter()
+    features = build_month_features(trips, distances, k=5, agg_func="median", seed=seed)
+    pipeline_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    target_encode_kfold(features, ["PULocationID", "DOLocationID", "pickup_hour"], "actual_speed_kmh")
+    encode_sec = time.perf_counter() - started
+
+    return {
+        "feature_pipeline": {
+            "metric": "rows_per_sec",
+            "value": num_rows / pipeline_sec,
+            "rows": num_rows,
+            "peak_rss_mb": _peak_rss_mb(),
+            "rss_before_mb": baseline_rss,
+        },
+        "target_encode_kfold": {
+            "metric": "rows_per_sec",
+            "value": num_rows / encode_sec,
+            "rows": num_rows,
+        },
+    }
+
+
+def bench_features(num_rows: int, seed: int) -> dict:
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(_run_feature_pipeline, num_rows, seed).result()
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list:
+    """Benchmarks whose headline metric regressed by more than max_regression.
+
+    A baseline entry may carry its own "max_regression" to override the default.
+    """
+    failures = []
+    for name, base in baseline["results"].items():
+        current = results["results"].get(name)
+        if current is None:
+            continue
+        allowed = base.get("max_regression", max_regression)
+        if DIRECTIONS[base["metric"]] == "lower":
+            change = current["value"] / base["value"] - 1
+        else:
+            change = 1 - current["value"] / base["value"]
+        if change > allowed:
+            failures.append(f"{name}: {base['value']:.1f} -> {current['value']:.1f} {base['metric']} "
+                            f"({change:+.0%} worse, allowed {allowed:.0%})")
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for prediction, dispatch and features.")
+    parser.add_argument("--output", type=Path, default=Path("benchmarks/results.json"))
+    parser.add_argument("--baseline", type=Path, help="fail if results regress against this JSON")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="allowed fractional regression per benchmark (default 0.25)")
+    parser.add_argument("--fleet-sizes", type=int, nargs="+", default=DEFAULT_FLEET_SIZES)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--feature-rows", type=int, default=500_000)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    configure_offline(args.seed)
+    results = {}
+    results.update(bench_prediction(args.repeats))
+    results.update(bench_dispatch(args.fleet_sizes, args.orders, args.seed))
+    results.update(bench_features(args.feature_rows, args.seed))
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "args": {k: str(v) for k, v in vars(args).items()},
+        },
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+    for name, result in results.items():
+        print(f"{name:32s} {result['value']:14.1f} {result['metric']}")
+    print(f"Saved results to {args.output}")
+
+    if args.baseline:
+        failures = compare(report, json.loads(args.baseline.read_text()), args.max_regression)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            return 1
+        print("No regressions against", args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+from src.data.zones import haversine_matrix
+from src.dispatch.predictors import FEATURE_COLUMNS
+from src.dispatch.zone_tables import NUM_HOURS, NUM_ZONES, ZoneTables
+
+NYC_LAT, NYC_LON = 40.73, -73.94
+
+
+def synthetic_zone_coords(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    lats = NYC_LAT + rng.normal(0, 0.08, NUM_ZONES)
+    lons = NYC_LON + rng.normal(0, 0.10, NUM_ZONES)
+    return lats, lons
+
+
+def synthetic_zone_tables(seed: int = 0, missing_fraction: float = 0.2) -> ZoneTables:
+    rng = np.random.default_rng(seed)
+    lats, lons = synthetic_zone_coords(seed)
+    distance = haversine_matrix(lats, lons).astype(np.float32)
+    distance[0, :] = np.nan
+    distance[:, 0] = np.nan
+
+    speed = rng.uniform(8, 40, (NUM_ZONES, NUM_ZONES, NUM_HOURS)).astype(np.float32)
+    speed[rng.random(speed.shape) < missing_fraction] = np.nan
+    return ZoneTables(distance, speed)
+
+
+def synthetic_trips(n: int, seed: int = 0, month: int = 6) -> pd.DataFrame:
+    """Trips in the cleaned (load_and_clean) format."""
+    rng = np.random.default_rng(seed)
+    pickup = pd.Timestamp(f"2025-{month:02d}-01") + pd.to_timedelta(rng.integers(0, 28 * 86400, n), unit="s")
+    eta_sec = rng.uniform(120, 3600, n)
+    return pd.DataFrame({
+        "tpep_pickup_datetime": pickup,
+        "tpep_dropoff_datetime": pickup + pd.to_timedelta(eta_sec, unit="s"),
+        "PULocationID": rng.integers(1, NUM_ZONES, n),
+        "DOLocationID": rng.integers(1, NUM_ZONES, n),
+        "trip_distance": rng.uniform(0.5, 15, n),
+        "eta_sec": eta_sec,
+    })
+
+
+def synthetic_distance_frame(zone_tables: ZoneTables) -> pd.DataFrame:
+    zones = np.arange(1, NUM_ZONES)
+    pu, do = np.meshgrid(zones, zones, indexing="ij")
+    return pd.DataFrame({
+        "PULocationID": pu.ravel(),
+        "DOLocationID": do.ravel(),
+        "great_circle_km": zone_tables.distance[pu.ravel(), do.ravel()].astype(np.float64),
+    })
+
+
+def train_synthetic_model(zone_tables: ZoneTables, n_rows: int = 20000, n_estimators: int = 100, seed: int = 0):
+    """Small XGBoost model with the production feature layout."""
+    import xgboost as xgb
+
+    rng = np.random.default_rng(seed)
+    pu = rng.integers(1, NUM_ZONES, n_rows)
+    do = rng.integers(1, NUM_ZONES, n_rows)
+    hour = rng.integers(0, NUM_HOURS, n_rows)
+    weekday = rng.integers(0, 7, n_rows)
+    km = zone_tables.distance_km(pu, do)
+    speed = zone_tables.speed_kmh(pu, do, hour)
+    X = pd.DataFrame({
+        "great_circle_km": km,
+        "pickup_hour": hour,
+        "pickup_weekday": weekday,
+        "is_weekend": weekday >= 5,
+        "pickup_month": np.full(n_rows, 6),
+        "historical_speed_kmh": speed,
+    }, columns=FEATURE_COLUMNS)
+    y = np.log1p(120 + 3600 * km / speed * rng.lognormal(0, 0.2, n_rows))
+
+    model = xgb.XGBRegressor(n_estimators=n_estimators, max_depth=6, tree_method="hist", random_state=seed)
+    model.fit(X, y)
+    return model
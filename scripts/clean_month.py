@@ -1,15 +1,19 @@
+import argparse
+from pathlib import Path
+
 print("▶️ Script started...")
 
 from src.data.load_and_clean import (
-    load_raw_data,
-    clean_eta_data,
-    save_clean_data,
+    stream_clean_data,
     RAW_DATA_PATH,
     PROCESSED_DATA_PATH,
 )
 print("▶️ Imports successful ✅")
 
-if __name__ == "__name__":
-    df_raw = load_raw_data(RAW_DATA_PATH)
-    df_clean = clean_eta_data(df_raw)
-    save_clean_data(df_clean, PROCESSED_DATA_PATH)
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean raw TLC monthly files into one parquet.")
+    parser.add_argument("inputs", nargs="*", help=f"raw parquet files or globs (default: {RAW_DATA_PATH})")
+    parser.add_argument("--out", type=Path, default=PROCESSED_DATA_PATH, help="cleaned parquet to write")
+    args = parser.parse_args()
+
+    stream_clean_data(args.inputs or RAW_DATA_PATH, args.out)
@@ -0,0 +1,71 @@
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+ZONE_IDS = list(range(1, 264))
+
+
+def run_level(base_url: str, endpoint: str, concurrency: int, duration: float, candidates: int) -> dict:
+    """Closed-loop load: ``concurrency`` clients each send requests back to back."""
+    deadline = time.perf_counter() + duration
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def client(seed: int):
+        rng = random.Random(seed)
+        session = requests.Session()
+        local, failed = [], 0
+        while time.perf_counter() < deadline:
+            payload = {
+                "pickup_zone": rng.choice(ZONE_IDS),
+                "dropoff_zone": rng.choice(ZONE_IDS),
+                "timestamp": rng.uniform(0, 7 * 86400),
+            }
+            if endpoint == "/eta/batch":
+                payload["courier_zones"] = rng.sample(ZONE_IDS, candidates)
+            started = time.perf_counter()
+            try:
+                session.post(f"{base_url}{endpoint}", json=payload, timeout=10).raise_for_status()
+                local.append(time.perf_counter() - started)
+            except requests.RequestException:
+                failed += 1
+        with lock:
+            latencies.extend(local)
+            errors.append(failed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(client, range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ms = np.array(latencies) * 1000
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": len(ms),
+        "errors": sum(errors),
+        "rps": len(ms) / elapsed,
+        "p50_ms": float(np.percentile(ms, 50)) if len(ms) else float("nan"),
+        "p99_ms": float(np.percentile(ms, 99)) if len(ms) else float("nan"),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test a running ETA service.")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--endpoint", choices=["/eta", "/eta/batch"], default="/eta")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--candidates", type=int, default=50, help="courier zones per /eta/batch request")
+    args = parser.parse_args()
+
+    print(f"{'endpoint':12s} {'conc':>5s} {'requests':>9s} {'errors':>7s} {'req/s':>9s} {'p50 ms':>8s} {'p99 ms':>8s}")
+    for level in args.concurrency:
+        r = run_level(args.url, args.endpoint, level, args.duration, args.candidates)
+        print(f"{r['endpoint']:12s} {r['concurrency']:5d} {r['requests']:9d} {r['errors']:7d} "
+              f"{r['rps']:9.1f} {r['p50_ms']:8.2f} {r['p99_ms']:8.2f}")
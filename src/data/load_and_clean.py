@@ -1,15 +1,32 @@
+import glob
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from pathlib import Path
+from typing import Iterator, List, Union
 
 RAW_DATA_PATH = Path("data/raw/yellow_tripdata_2025-06.parquet")
 PROCESSED_DATA_PATH = Path("data/processed/yellow_tripdata_2025-06-cleaned.parquet")
 
+RAW_COLUMNS = [
+    "tpep_pickup_datetime","tpep_dropoff_datetime",
+    "PULocationID","DOLocationID","trip_distance"
+]
+CLEAN_SCHEMA = pa.schema([
+    ("tpep_pickup_datetime", pa.timestamp("us")),
+    ("tpep_dropoff_datetime", pa.timestamp("us")),
+    ("PULocationID", pa.int64()),
+    ("DOLocationID", pa.int64()),
+    ("trip_distance", pa.float64()),
+    ("eta_sec", pa.float64()),
+])
 
-def load_raw_data(path: Path) -> pd.DataFrame:
+
+def load_raw_data(path: Path, columns: List[str] = RAW_COLUMNS) -> pd.DataFrame:
     print("▶️ Loading raw data from:", path)
-    df = pd.read_parquet(path)
+    df = pd.read_parquet(path, columns=columns)
     print("Loaded Shape: ", df.shape)
-    print("Columns: ", df.columns.tolist())
     return df
 
 def clean_eta_data(df: pd.DataFrame) -> pd.DataFrame:
@@ -39,7 +56,73 @@ def save_clean_data(df: pd.DataFrame, path: Path) -> None:
     df.to_parquet(path, index=False)
     print(f"Saved cleaned data to {path}")
 
+
+def resolve_inputs(inputs: Union[str, Path, List[Union[str, Path]]]) -> List[Path]:
+    """Expand a path, glob pattern or list of either into sorted files."""
+    if isinstance(inputs, (str, Path)):
+        inputs = [inputs]
+    paths = []
+    for item in inputs:
+        matches = sorted(glob.glob(str(item)))
+        if not matches:
+            raise FileNotFoundError(f"No input files match {item}")
+        paths.extend(Path(m) for m in matches)
+    return paths
+
+def clean_eta_batch(batch: pa.RecordBatch) -> pa.Table:
+    """Arrow-compute version of clean_eta_data for a single batch."""
+    table = pa.Table.from_batches([batch]).cast(pa.schema([
+        (name, CLEAN_SCHEMA.field(name).type) for name in RAW_COLUMNS
+    ]))
+    duration = pc.subtract(table["tpep_dropoff_datetime"], table["tpep_pickup_datetime"])
+    eta_sec = pc.divide(pc.cast(pc.cast(duration, pa.duration("us")), pa.int64()), 1_000_000.0)
+    speed_kmh = pc.divide(
+        pc.multiply(table["trip_distance"], 1.60934),
+        pc.divide(eta_sec, 3600.0),
+    )
+
+    mask = pc.and_(
+        pc.and_(pc.greater_equal(eta_sec, 120), pc.less_equal(eta_sec, 7200)),
+        pc.and_(
+            pc.greater_equal(table["trip_distance"], 0.2),
+            pc.and_(pc.greater_equal(speed_kmh, 3), pc.less_equal(speed_kmh, 120)),
+        ),
+    )
+    return table.append_column("eta_sec", eta_sec).filter(mask)
+
+def iter_clean_batches(paths: List[Path], batch_size: int = None) -> Iterator[pa.Table]:
+    """Cleaned batches, one raw row group (or ``batch_size`` rows) at a time."""
+    for path in paths:
+        parquet_file = pq.ParquetFile(path)
+        if batch_size is None:
+            for i in range(parquet_file.num_row_groups):
+                for batch in parquet_file.read_row_group(i, columns=RAW_COLUMNS).to_batches():
+                    yield clean_eta_batch(batch)
+        else:
+            for batch in parquet_file.iter_batches(batch_size=batch_size, columns=RAW_COLUMNS):
+                yield clean_eta_batch(batch)
+
+def stream_clean_data(inputs, output_path: Path, batch_size: int = None) -> int:
+    """Clean one or many raw monthly files into a single parquet, streaming.
+
+    Only the columns clean_eta_data needs are read, and peak memory is one
+    row group rather than the whole dataset. Returns rows written.
+    """
+    paths = resolve_inputs(inputs)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    rows_in, rows_out = 0, 0
+
+    with pq.ParquetWriter(output_path, CLEAN_SCHEMA) as writer:
+        for path in paths:
+            print("▶️ Streaming raw data from:", path)
+            rows_in += pq.ParquetFile(path).metadata.num_rows
+            for table in iter_clean_batches([path], batch_size):
+                if table.num_rows:
+                    writer.write_table(table)
+                    rows_out += table.num_rows
+
+    print(f"Saved {rows_out}/{rows_in} cleaned rows to {output_path}")
+    return rows_out
+
 if __name__ == "__main__":
-    df_raw = load_raw_data(RAW_DATA_PATH)
-    df_clean = clean_eta_data(df_raw)
-    save_clean_data(df_clean, PROCESSED_DATA_PATH)
\ No newline at end of file
+    stream_clean_data(RAW_DATA_PATH, PROCESSED_DATA_PATH)
@@ -1,8 +1,13 @@
 import geopandas as gpd
 from pathlib import Path
-from math import radians, sin, cos, sqrt, atan2
+from typing import Iterator, Tuple
+import numpy as np
 import pandas as pd
 
+from src.dispatch.zone_tables import NUM_ZONES
+
+EARTH_RADIUS_KM = 6371
+
 def load_zone_centroids(shapefile_path: Path) -> dict[int, tuple[float, float]]:
     gdf = gpd.read_file(shapefile_path)
 
@@ -16,27 +21,58 @@ def load_zone_centroids(shapefile_path: Path) -> dict[int, tuple[float, float]]:
 
 
 def compute_zone_distance_matrix(zone_to_coords: dict[int, tuple[float, float]]) -> pd.DataFrame:
-    data = []
-    zone_ids = list(zone_to_coords.keys())
-
-    for pu in zone_ids:
-        for do in zone_ids:
-            lat1, lon1 = zone_to_coords[pu]
-            lat2, lon2 = zone_to_coords[do]
-            km = haversine_distance(lat1, lon1, lat2, lon2)
-            data.append((pu, do, km))
-    
-    df = pd.DataFrame(data, columns=["PULocationID", "DOLocationID", "great_circle_km"])
+    zone_ids = np.array(list(zone_to_coords.keys()))
+    lats, lons = np.array(list(zone_to_coords.values()), dtype=np.float64).T
+    km = haversine_matrix(lats, lons)
+
+    df = pd.DataFrame({
+        "PULocationID": np.repeat(zone_ids, len(zone_ids)),
+        "DOLocationID": np.tile(zone_ids, len(zone_ids)),
+        "great_circle_km": km.ravel(),
+    })
     return df
 
 
-def haversine_distance(lat1, lon1, lat2, lon2) -> float:
-    R = 6371  # Earth radius in km
-    dlat = radians(lat2 - lat1)
-    dlon = radians(lon2 - lon1)
-    a = sin(dlat / 2)**2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
-    return R * c
+def compute_zone_distance_array(zone_to_coords: dict[int, tuple[float, float]], num_zones: int = NUM_ZONES) -> np.ndarray:
+    """Dense float32 (num_zones x num_zones) matrix indexed by zone id; NaN where a zone is unknown."""
+    zone_ids = np.array(list(zone_to_coords.keys()))
+    lats, lons = np.array(list(zone_to_coords.values()), dtype=np.float64).T
+    inside = zone_ids < num_zones
+
+    dense = np.full((num_zones, num_zones), np.nan, dtype=np.float32)
+    dense[np.ix_(zone_ids[inside], zone_ids[inside])] = haversine_matrix(lats[inside], lons[inside])
+    return dense
+
+
+def haversine_distance(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km; accepts scalars or broadcastable arrays of degrees."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return EARTH_RADIUS_KM * c
+
+
+def haversine_matrix(lats_a, lons_a, lats_b=None, lons_b=None) -> np.ndarray:
+    """All-pairs great-circle distances (len(a) x len(b)) in km; b defaults to a."""
+    if lats_b is None:
+        lats_b, lons_b = lats_a, lons_a
+    lats_a, lons_a = np.asarray(lats_a)[:, None], np.asarray(lons_a)[:, None]
+    lats_b, lons_b = np.asarray(lats_b)[None, :], np.asarray(lons_b)[None, :]
+    return haversine_distance(lats_a, lons_a, lats_b, lons_b)
+
+
+def iter_distance_chunks(lats, lons, chunk_size: int = 2048) -> Iterator[Tuple[int, np.ndarray]]:
+    """Yield (row_offset, block) pieces of the all-pairs matrix for large node sets.
+
+    Each block holds ``chunk_size`` origin rows against every destination, so
+    memory stays at chunk_size x n regardless of how many nodes there are.
+    """
+    lats, lons = np.asarray(lats), np.asarray(lons)
+    for start in range(0, len(lats), chunk_size):
+        stop = start + chunk_size
+        yield start, haversine_matrix(lats[start:stop], lons[start:stop], lats, lons)
 
 
 if __name__ == "__main__":
@@ -52,4 +88,6 @@ if __name__ == "__main__":
 
     # Save to file
     distance_df.to_parquet("data/geo/zone_distance_matrix.parquet", index=False)
-    print("✅ Saved distance matrix to data/geo/zone_distance_matrix.parquet")
\ No newline at end of file
+    print("✅ Saved distance matrix to data/geo/zone_distance_matrix.parquet")
+    np.save("data/geo/zone_distance_matrix.npy", compute_zone_distance_array(zone_centroids))
+    print("✅ Saved dense distance matrix to data/geo/zone_distance_matrix.npy")
\ No newline at end of file
@@ -0,0 +1,145 @@
+from array import array
+from typing import Iterator, List
+
+import numpy as np
+import pandas as pd
+
+from src.dispatch.simulator import Courier, Order
+
+ORDER_COLUMNS = ["order_id", "timestamp", "pickup_zone", "dropoff_zone"]
+
+
+class Fleet:
+    """Couriers as parallel NumPy arrays.
+
+    Indexing or iterating yields Courier snapshots of the current state, so
+    code written against List[Courier] (e.g. the Streamlit app) keeps working.
+    """
+
+    def __init__(self, courier_id, current_zone, available_at, total_work_time=None):
+        self.courier_id = np.asarray(courier_id, dtype=np.int64)
+        self.current_zone = np.asarray(current_zone, dtype=np.int64)
+        self.available_at = np.asarray(available_at, dtype=np.float64)
+        if total_work_time is None:
+            total_work_time = np.zeros(len(self.courier_id))
+        self.total_work_time = np.asarray(total_work_time, dtype=np.float64)
+
+    @classmethod
+    def from_couriers(cls, couriers: List[Courier]) -> "Fleet":
+        return cls(
+            [c.courier_id for c in couriers],
+            [c.current_zone for c in couriers],
+            [c.available_at for c in couriers],
+            [c.total_work_time for c in couriers],
+        )
+
+    def __len__(self) -> int:
+        return len(self.courier_id)
+
+    def __getitem__(self, idx: int) -> Courier:
+        return Courier(
+            courier_id=int(self.courier_id[idx]),
+            current_zone=int(self.current_zone[idx]),
+            available_at=float(self.available_at[idx]),
+            total_work_time=float(self.total_work_time[idx]),
+        )
+
+    def __iter__(self) -> Iterator[Courier]:
+        return (self[idx] for idx in range(len(self)))
+
+    def write_back(self, couriers: List[Courier]) -> None:
+        """Copy the fleet state onto the Courier objects it was built from."""
+        for courier, zone, available_at, work in zip(
+            couriers, self.current_zone.tolist(), self.available_at.tolist(), self.total_work_time.tolist()
+        ):
+            courier.current_zone = zone
+            courier.available_at = available_at
+            courier.total_work_time = work
+
+    def update_from(self, couriers: List[Courier]) -> None:
+        """Copy the state of Courier objects (in fleet order) into the arrays."""
+        self.current_zone[:] = [c.current_zone for c in couriers]
+        self.available_at[:] = [c.available_at for c in couriers]
+        self.total_work_time[:] = [c.total_work_time for c in couriers]
+
+
+class OrderTable:
+    """Orders as typed NumPy columns; indexing or iterating yields Order views."""
+
+    def __init__(self, order_id, timestamp, pickup_zone, dropoff_zone):
+        self.order_id = np.asarray(order_id, dtype=np.int64)
+        self.timestamp = np.asarray(timestamp, dtype=np.float64)
+        self.pickup_zone = np.asarray(pickup_zone, dtype=np.int64)
+        self.dropoff_zone = np.asarray(dropoff_zone, dtype=np.int64)
+
+    @classmethod
+    def from_orders(cls, orders: List[Order]) -> "OrderTable":
+        return cls(
+            [o.order_id for o in orders],
+            [o.timestamp for o in orders],
+            [o.pickup_zone for o in orders],
+            [o.dropoff_zone for o in orders],
+        )
+
+    @classmethod
+    def from_arrow(cls, table) -> "OrderTable":
+        """From a pyarrow Table or pandas DataFrame with ORDER_COLUMNS."""
+        return cls(*(np.asarray(table[name]) for name in ORDER_COLUMNS))
+
+    def __len__(self) -> int:
+        return len(self.order_id)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return OrderTable(self.order_id[idx], self.timestamp[idx], self.pickup_zone[idx], self.dropoff_zone[idx])
+        return Order(
+            order_id=int(self.order_id[idx]),
+            timestamp=float(self.timestamp[idx]),
+            pickup_zone=int(self.pickup_zone[idx]),
+            dropoff_zone=int(self.dropoff_zone[idx]),
+        )
+
+    def __iter__(self) -> Iterator[Order]:
+        columns = (self.order_id, self.timestamp, self.pickup_zone, self.dropoff_zone)
+        for start in range(0, len(self), 65536):
+            chunk = [column[start:start + 65536].tolist() for column in columns]
+            for order_id, timestamp, pickup_zone, dropoff_zone in zip(*chunk):
+                yield Order(order_id, timestamp, pickup_zone, dropoff_zone)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({name: getattr(self, name) for name in ORDER_COLUMNS})
+
+
+class AssignmentColumns:
+    """Append-only (order_id, courier_id, eta) log in typed arrays.
+
+    Behaves like the list of tuples kept in object mode (len, indexing,
+    iteration) at a fraction of the memory.
+    """
+
+    def __init__(self):
+        self.order_id = array("q")
+        self.courier_id = array("q")
+        self.eta = array("d")
+
+    def append(self, row) -> None:
+        order_id, courier_id, eta = row
+        self.order_id.append(order_id)
+        self.courier_id.append(courier_id)
+        self.eta.append(eta)
+
+    def __len__(self) -> int:
+        return len(self.order_id)
+
+    def __getitem__(self, idx: int):
+        return self.order_id[idx], self.courier_id[idx], self.eta[idx]
+
+    def __iter__(self):
+        return zip(self.order_id, self.courier_id, self.eta)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "order_id": np.array(self.order_id, dtype=np.int64),
+            "courier_id": np.array(self.courier_id, dtype=np.int64),
+            "eta_sec": np.array(self.eta, dtype=np.float64),
+        })
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from src.dispatch.predictors import SIM_START, FEATURE_COLUMNS, time_feature_arrays, time_features
+from src.dispatch.resources import ETA_TABLE_PATH, Resources, get_resources
+from src.dispatch.zone_tables import NUM_ZONES, NUM_HOURS
+
+NUM_WEEKDAYS = 7
+
+
+def build_eta_table(resources: Resources = None, month: int = SIM_START.month) -> np.ndarray:
+    """Evaluate the model over every (PU, DO, hour, weekday) cell.
+
+    Missing zone pairs get the same 5.0 km / 20 km/h defaults as predict_eta,
+    so the table reproduces it for every integer zone id.
+    """
+    resources = resources or get_resources()
+    zones = np.arange(NUM_ZONES)
+    pu_grid, do_grid = np.meshgrid(zones, zones, indexing="ij")
+    pu_flat, do_flat = pu_grid.ravel(), do_grid.ravel()
+    n_pairs = len(pu_flat)
+
+    distance_km = resources.zone_tables.distance_km(pu_flat, do_flat)
+    table = np.empty((NUM_ZONES, NUM_ZONES, NUM_HOURS, NUM_WEEKDAYS), dtype=np.float32)
+
+    for hour in range(NUM_HOURS):
+        speed_kmh = resources.zone_tables.speed_kmh(pu_flat, do_flat, hour)
+        weekdays = np.repeat(np.arange(NUM_WEEKDAYS), n_pairs)
+        features = pd.DataFrame({
+            "great_circle_km": np.tile(distance_km, NUM_WEEKDAYS),
+            "pickup_hour": np.full(len(weekdays), hour),
+            "pickup_weekday": weekdays,
+            "is_weekend": weekdays >= 5,
+            "pickup_month": np.full(len(weekdays), month),
+            "historical_speed_kmh": np.tile(speed_kmh, NUM_WEEKDAYS),
+        }, columns=FEATURE_COLUMNS)
+
+        etas = np.expm1(resources.model.predict(features))
+        table[:, :, hour, :] = etas.reshape(NUM_WEEKDAYS, NUM_ZONES, NUM_ZONES).transpose(1, 2, 0)
+        print(f"Hour {hour:02d} done")
+
+    return table
+
+
+def save_eta_table(table: np.ndarray, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(path, table)
+    print(f"Saved ETA table {table.shape} to {path}")
+
+
+class ETATablePredictor:
+    """Drop-in batch eta_predictor backed by a precomputed ETA table.
+
+    The table is memory-mapped, so every leg ETA is a single array read.
+    Predictions are for the month the table was built for.
+    """
+
+    def __init__(self, path: Path = ETA_TABLE_PATH, mmap: bool = True):
+        self.table = np.load(path, mmap_mode="r" if mmap else None)
+
+    def leg_etas(self, pu_zones, do_zones, current_time) -> np.ndarray:
+        """Leg ETAs; current_time is one time or one per leg."""
+        if np.ndim(current_time) == 0:
+            hour, weekday, _, _ = time_features(current_time)
+        else:
+            hour, weekday, _, _ = time_feature_arrays(current_time)
+        return self.table[pu_zones, do_zones, hour, weekday]
+
+    def __call__(self, order, current_time, courier_zones) -> np.ndarray:
+        hour, weekday, _, _ = time_features(current_time)
+        courier_zones = np.asarray(courier_zones)
+        to_pickup_etas = self.table[courier_zones, order.pickup_zone, hour, weekday]
+        trip_eta = self.table[order.pickup_zone, order.dropoff_zone, hour, weekday]
+        return to_pickup_etas + trip_eta
+
+    def eta_matrix(self, orders, current_time, courier_zones) -> np.ndarray:
+        """Total ETA for every (courier, order) pair."""
+        hour, weekday, _, _ = time_features(current_time)
+        courier_zones = np.asarray(courier_zones)
+        pickups = np.array([o.pickup_zone for o in orders])
+        dropoffs = np.array([o.dropoff_zone for o in orders])
+        to_pickup_etas = self.table[courier_zones[:, None], pickups[None, :], hour, weekday]
+        trip_etas = self.table[pickups, dropoffs, hour, weekday]
+        return to_pickup_etas + trip_etas
+
+
+if __name__ == "__main__":
+    table = build_eta_table()
+    save_eta_table(table, ETA_TABLE_PATH)
@@ -0,0 +1,127 @@
+import json
+from bisect import bisect_left
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+DEFAULT_LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+DEFAULT_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000, 10000)
+
+_current = ContextVar("dispatch_instrumentation", default=None)
+
+
+def current_instrumentation():
+    """Sink of the simulation running in this context, or None.
+
+    Predictors use this to report feature/inference timings and cache
+    hits without being handed the sink explicitly.
+    """
+    return _current.get()
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        cumulative, running = [], 0
+        for count in self.counts:
+            running += count
+            cumulative.append(running)
+        return {
+            "buckets": [*self.buckets, "+Inf"],
+            "cumulative_counts": cumulative,
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+class Instrumentation:
+    """Collects per-phase timings, counters, histograms and gauges for one or more runs.
+
+    Pass it as DispatchSimulator(..., instrumentation=sink). Everything is
+    in-process and cheap; export with snapshot(), to_json() or to_prometheus().
+    """
+
+    def __init__(self, latency_buckets_ms=DEFAULT_LATENCY_BUCKETS_MS, max_gauge_samples: int = 10_000):
+        self.phase_seconds = defaultdict(float)
+        self.phase_calls = defaultdict(int)
+        self.counters = defaultdict(int)
+        self.histograms = {
+            "decision_latency_ms": Histogram(latency_buckets_ms),
+            "candidates_per_order": Histogram(DEFAULT_COUNT_BUCKETS),
+        }
+        self.gauges = defaultdict(lambda: deque(maxlen=max_gauge_samples))
+
+    @contextmanager
+    def activate(self):
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phase_seconds[name] += seconds
+        self.phase_calls[name] += 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def observe(self, name: str, value: float) -> None:
+        self.histograms[name].observe(value)
+
+    def gauge(self, name: str, sim_time: float, value: float) -> None:
+        """Record a (simulation time, value) sample, e.g. queue length over time."""
+        self.gauges[name].append((sim_time, value))
+
+    def snapshot(self) -> dict:
+        return {
+            "phases": {
+                name: {"seconds": seconds, "calls": self.phase_calls[name]}
+                for name, seconds in self.phase_seconds.items()
+            },
+            "counters": dict(self.counters),
+            "histograms": {name: h.snapshot() for name, h in self.histograms.items()},
+            "gauges": {name: list(samples) for name, samples in self.gauges.items()},
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "eta_dispatch") -> str:
+        lines = [
+            f"# HELP {prefix}_phase_seconds_total Wall-clock seconds spent per simulator phase.",
+            f"# TYPE {prefix}_phase_seconds_total counter",
+        ]
+        for name, seconds in sorted(self.phase_seconds.items()):
+            lines.append(f'{prefix}_phase_seconds_total{{phase="{name}"}} {seconds}')
+        lines.append(f"# TYPE {prefix}_phase_calls_total counter")
+        for name, calls in sorted(self.phase_calls.items()):
+            lines.append(f'{prefix}_phase_calls_total{{phase="{name}"}} {calls}')
+
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+
+        for name, histogram in sorted(self.histograms.items()):
+            snap = histogram.snapshot()
+            lines.append(f"# TYPE {prefix}_{name} histogram")
+            for le, count in zip(snap["buckets"], snap["cumulative_counts"]):
+                lines.append(f'{prefix}_{name}_bucket{{le="{le}"}} {count}')
+            lines.append(f"{prefix}_{name}_sum {snap['sum']}")
+            lines.append(f"{prefix}_{name}_count {snap['count']}")
+
+        for name, samples in sorted(self.gauges.items()):
+            if samples:
+                lines.append(f"# TYPE {prefix}_{name} gauge")
+                lines.append(f"{prefix}_{name} {samples[-1][1]}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,103 @@
+import time
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+
+from src.dispatch.instrumentation import current_instrumentation
+
+SIM_START = datetime(2025, 6, 1)
+FEATURE_COLUMNS = [
+    "great_circle_km",
+    "pickup_hour",
+    "pickup_weekday",
+    "is_weekend",
+    "pickup_month",
+    "historical_speed_kmh",
+]
+
+
+def time_features(current_time):
+    dt = SIM_START + timedelta(seconds=float(current_time))
+    weekday = dt.weekday()
+    return dt.hour, weekday, weekday >= 5, dt.month
+
+
+def time_feature_arrays(current_times):
+    """Vectorized time_features for an array of simulation times."""
+    offsets = np.round(np.asarray(current_times, dtype=np.float64) * 1e6).astype("timedelta64[us]")
+    dt = np.datetime64(SIM_START, "us") + offsets
+    days = dt.astype("datetime64[D]")
+    hour = ((dt - days) // np.timedelta64(1, "h")).astype(np.int64)
+    weekday = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    month = days.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    return hour, weekday, weekday >= 5, month
+
+
+class XGBoostETAPredictor:
+    """Batch eta_predictor that runs the XGBoost model directly."""
+
+    def __init__(self, model, zone_tables):
+        self.model = model
+        self.zone_tables = zone_tables
+
+    def leg_features(self, pu_zones, do_zones, current_time) -> pd.DataFrame:
+        """Model features per leg; current_time is one time or one per leg."""
+        if np.ndim(current_time) == 0:
+            hour, weekday, is_weekend, month = time_features(current_time)
+        else:
+            hour, weekday, is_weekend, month = time_feature_arrays(current_time)
+        pu_zones = np.asarray(pu_zones)
+        do_zones = np.asarray(do_zones)
+        n = len(pu_zones)
+
+        return pd.DataFrame({
+            "great_circle_km": self.zone_tables.distance_km(pu_zones, do_zones),
+            "pickup_hour": np.broadcast_to(hour, n),
+            "pickup_weekday": np.broadcast_to(weekday, n),
+            "is_weekend": np.broadcast_to(is_weekend, n),
+            "pickup_month": np.broadcast_to(month, n),
+            "historical_speed_kmh": self.zone_tables.speed_kmh(pu_zones, do_zones, hour),
+        }, columns=FEATURE_COLUMNS)
+
+    def leg_etas(self, pu_zones, do_zones, current_time) -> np.ndarray:
+        inst = current_instrumentation()
+        if inst is None:
+            log_eta_pred = self.model.predict(self.leg_features(pu_zones, do_zones, current_time))
+            return np.expm1(log_eta_pred)
+
+        started = time.perf_counter()
+        features = self.leg_features(pu_zones, do_zones, current_time)
+        built = time.perf_counter()
+        log_eta_pred = self.model.predict(features)
+        inst.add_phase("feature_construction", built - started)
+        inst.add_phase("model_inference", time.perf_counter() - built)
+        inst.count("model_calls")
+        inst.count("model_rows", len(features))
+        return np.expm1(log_eta_pred)
+
+    def __call__(self, order, current_time, courier_zones) -> np.ndarray:
+        """Total ETA (courier -> pickup -> dropoff) for every candidate courier zone.
+
+        All to-pickup legs and the single trip leg go through one model call.
+        """
+        courier_zones = np.asarray(courier_zones)
+        n = len(courier_zones)
+        pu_zones = np.append(courier_zones, order.pickup_zone)
+        do_zones = np.append(np.full(n, order.pickup_zone), order.dropoff_zone)
+        etas = self.leg_etas(pu_zones, do_zones, current_time)
+        to_pickup_etas, trip_eta = etas[:n], etas[n]
+        return to_pickup_etas + trip_eta
+
+    def eta_matrix(self, orders, current_time, courier_zones) -> np.ndarray:
+        """Total ETA for every (courier, order) pair from a single model call."""
+        courier_zones = np.asarray(courier_zones)
+        pickups = np.array([o.pickup_zone for o in orders])
+        dropoffs = np.array([o.dropoff_zone for o in orders])
+        n_couriers, n_orders = len(courier_zones), len(pickups)
+
+        pu_zones = np.concatenate([np.repeat(courier_zones, n_orders), pickups])
+        do_zones = np.concatenate([np.tile(pickups, n_couriers), dropoffs])
+        etas = self.leg_etas(pu_zones, do_zones, current_time)
+        to_pickup_etas = etas[:n_couriers * n_orders].reshape(n_couriers, n_orders)
+        trip_etas = etas[n_couriers * n_orders:]
+        return to_pickup_etas + trip_etas
@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.dispatch.zone_tables import NUM_ZONES, ZoneTables
+
+
+@dataclass
+class CandidatePruning:
+    """Only score idle couriers near the pickup.
+
+    Zones are visited nearest-first from the pickup zone until at least
+    ``k`` idle couriers are found or the next zone is beyond
+    ``max_radius_km``. If nothing is in range, all idle couriers are scored.
+    With ``audit`` on, every pruned decision is also checked against an
+    exhaustive search.
+    """
+    k: int = 10
+    max_radius_km: float = 5.0
+    audit: bool = False
+
+
+class ZoneProximityIndex:
+    """For each zone, every other zone ordered by great-circle distance."""
+
+    def __init__(self, neighbours: np.ndarray, neighbour_km: np.ndarray):
+        self.neighbours = neighbours
+        self.neighbour_km = neighbour_km
+
+    @classmethod
+    def from_zone_tables(cls, zone_tables: ZoneTables) -> "ZoneProximityIndex":
+        zones = np.arange(NUM_ZONES)
+        # Raw distances, not distance_km(): its ETA default for missing pairs
+        # would put zones without coordinates near every other zone.
+        km = np.array(zone_tables.distance[zones[:, None], zones[None, :]], dtype=np.float32)
+        km[np.isnan(km)] = np.inf
+        np.fill_diagonal(km, 0.0)
+        km[0, :] = np.inf  # zone 0 does not exist
+        km[:, 0] = np.inf
+
+        neighbours = np.argsort(km, axis=1, kind="stable").astype(np.int16)
+        neighbour_km = np.take_along_axis(km, neighbours, axis=1)
+        return cls(neighbours, neighbour_km)
+
+    def nearby(self, zone: int, max_radius_km: float):
+        """Zones within ``max_radius_km`` of ``zone``, nearest first."""
+        n = int(np.searchsorted(self.neighbour_km[zone], max_radius_km, side="right"))
+        return self.neighbours[zone, :n]
@@ -0,0 +1,178 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import numpy as np
+
+from src.dispatch.instrumentation import current_instrumentation
+from src.dispatch.resources import ResourceConfig, Resources, use_resources
+
+FEATURES_DIR = Path("data/processed/features")
+
+
+@dataclass(frozen=True)
+class ModelKey:
+    model: str
+    version: str
+    month: str
+
+
+def monthly_config(month: str, base: ResourceConfig = None, tables_dir: Path = Path("data/geo")) -> ResourceConfig:
+    """Config whose speed table (and ETA table) is built from the ``month`` features partition."""
+    base = base or ResourceConfig()
+    return replace(
+        base,
+        speed_path=FEATURES_DIR,
+        speed_month=month,
+        speed_table_path=tables_dir / f"zone_speed_kmh_{month}.npy",
+        eta_table_path=base.eta_table_path.with_name(f"{base.eta_table_path.stem}_{month}.npy"),
+    )
+
+
+def estimate_nbytes(resources: Resources) -> int:
+    """Approximate memory held by loaded resources: their arrays plus the model file size."""
+    seen = set()
+
+    def array_bytes(obj, depth=0) -> int:
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+        if isinstance(obj, np.ndarray):
+            return obj.nbytes
+        if depth >= 2 or not hasattr(obj, "__dict__"):
+            return 0
+        return sum(array_bytes(value, depth + 1) for value in vars(obj).values())
+
+    total = sum(array_bytes(obj) for obj in resources._cache.values())
+    if "model" in resources._cache and Path(resources.config.model_path).exists():
+        total += Path(resources.config.model_path).stat().st_size
+    return total
+
+
+class _Entry:
+    def __init__(self, resources: Resources, nbytes: int, load_seconds: float):
+        self.resources = resources
+        self.nbytes = nbytes
+        self.load_seconds = load_seconds
+        self.hits = 0
+
+
+class ModelRegistry:
+    """Loads predictors and their lookup tables per ModelKey, keeping the most recently used.
+
+    Entries are evicted least-recently-used first once their estimated size
+    exceeds ``budget_bytes``; the active entry is never evicted. Evicting or
+    swapping only drops the registry's reference, so simulations already
+    holding a predictor finish on it undisturbed.
+    """
+
+    def __init__(self, budget_bytes: int = 2 << 30, configs: dict = None):
+        self.budget_bytes = budget_bytes
+        self._configs = dict(configs or {})
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._loading = {}
+        self._active = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_seconds = 0.0
+
+    def register(self, key: ModelKey, config: ResourceConfig) -> None:
+        with self._lock:
+            self._configs[key] = config
+            entry = self._entries.pop(key, None)
+        if entry is not None and key == self._active:
+            self.activate(key)
+
+    def get(self, key: ModelKey) -> Resources:
+        """Resources for ``key`` with the predictor loaded, from cache or freshly built."""
+        inst = current_instrumentation()
+        with self._lock:
+            entry = self._touch(key)
+            if entry is None:
+                if key not in self._configs:
+                    raise KeyError(f"No config registered for {key}")
+                key_lock = self._loading.setdefault(key, threading.Lock())
+        if entry is not None:
+            if inst is not None:
+                inst.count("cache_hits")
+            return entry.resources
+
+        # Load outside the registry lock so other keys stay available; the
+        # per-key lock makes concurrent misses on one key load it once.
+        with key_lock:
+            with self._lock:
+                entry = self._touch(key)
+            if entry is not None:
+                if inst is not None:
+                    inst.count("cache_hits")
+                return entry.resources
+
+            started = time.perf_counter()
+            resources = Resources(self._configs[key])
+            resources.predictor
+            elapsed = time.perf_counter() - started
+            entry = _Entry(resources, estimate_nbytes(resources), elapsed)
+            with self._lock:
+                self.misses += 1
+                self.load_seconds += elapsed
+                self._entries[key] = entry
+                self._loading.pop(key, None)
+                self._evict()
+        if inst is not None:
+            inst.count("cache_misses")
+            inst.add_phase("model_load", elapsed)
+        return resources
+
+    def predictor(self, key: ModelKey):
+        return self.get(key).predictor
+
+    def activate(self, key: ModelKey) -> Resources:
+        """Load ``key`` if needed and atomically make it the shared default (get_resources())."""
+        resources = self.get(key)
+        with self._lock:
+            self._active = key
+            use_resources(resources)
+        return resources
+
+    @property
+    def active(self) -> ModelKey:
+        return self._active
+
+    def _touch(self, key: ModelKey):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            self.hits += 1
+        return entry
+
+    def _evict(self) -> None:
+        total = sum(entry.nbytes for entry in self._entries.values())
+        newest = next(reversed(self._entries))
+        for key in list(self._entries):
+            if total <= self.budget_bytes:
+                break
+            if key == self._active or key == newest:
+                continue
+            total -= self._entries.pop(key).nbytes
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "load_seconds": self.load_seconds,
+                "bytes": sum(entry.nbytes for entry in self._entries.values()),
+                "budget_bytes": self.budget_bytes,
+                "active": self._active,
+                "entries": [
+                    {"key": key, "bytes": entry.nbytes, "load_seconds": entry.load_seconds, "hits": entry.hits}
+                    for key, entry in self._entries.items()
+                ],
+            }
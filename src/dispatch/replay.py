@@ -0,0 +1,108 @@
+from datetime import datetime
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from src.data.load_and_clean import PROCESSED_DATA_PATH, resolve_inputs
+from src.dispatch.columnar import OrderTable
+from src.dispatch.predictors import SIM_START
+from src.dispatch.zone_tables import NUM_ZONES
+
+REPLAY_COLUMNS = ["tpep_pickup_datetime", "PULocationID", "DOLocationID"]
+
+
+def read_trip_window(inputs=PROCESSED_DATA_PATH, start=None, end=None):
+    """Pickup times and zones of cleaned trips with start <= pickup < end.
+
+    Files are memory-mapped and only the three replay columns are read; the
+    window is pushed down to the parquet reader as a row filter.
+    """
+    filters = []
+    if start is not None:
+        filters.append(("tpep_pickup_datetime", ">=", np.datetime64(start, "us")))
+    if end is not None:
+        filters.append(("tpep_pickup_datetime", "<", np.datetime64(end, "us")))
+
+    pickups, pu_zones, do_zones = [], [], []
+    for path in resolve_inputs(inputs):
+        table = pq.read_table(path, columns=REPLAY_COLUMNS, filters=filters or None, memory_map=True)
+        pickups.append(table["tpep_pickup_datetime"].to_numpy().astype("datetime64[us]"))
+        pu_zones.append(table["PULocationID"].to_numpy())
+        do_zones.append(table["DOLocationID"].to_numpy())
+    return np.concatenate(pickups), np.concatenate(pu_zones), np.concatenate(do_zones)
+
+
+def resample_times(
+        timestamps: np.ndarray,
+        factor: float,
+        rng: np.random.Generator,
+        jitter_sec: float,
+        window: tuple = None):
+    """Row indices and times thinned (factor < 1) or replicated (factor > 1) to ``factor`` x the rate.
+
+    Each trip is kept floor(factor) times plus once more with probability
+    frac(factor), so hourly and zonal demand keep their shape. Copies beyond
+    the first are shifted by uniform(-jitter_sec, jitter_sec); with a
+    ``window`` of (low, high) seconds, shifts past either edge are reflected
+    back so every time stays in [low, high).
+    """
+    copies = np.floor(factor).astype(np.int64) + (rng.random(len(timestamps)) < factor % 1)
+    rows = np.repeat(np.arange(len(timestamps)), copies)
+    times = timestamps[rows]
+    is_copy = np.ones(len(rows), dtype=bool)
+    is_copy[np.cumsum(copies)[copies > 0] - copies[copies > 0]] = False
+    times[is_copy] += rng.uniform(-jitter_sec, jitter_sec, int(is_copy.sum()))
+    if window is not None:
+        low, high = window
+        times = np.where(times < low, 2 * low - times, times)
+        times = np.where(times >= high, 2 * high - times, times)
+        # Reflection can overshoot when the jitter is wider than the window.
+        times = np.clip(times, low, np.nextafter(high, low))
+    return rows, times
+
+
+def replay_orders(
+        inputs=PROCESSED_DATA_PATH,
+        start=None,
+        end=None,
+        target_rate: float = None,
+        jitter_sec: float = 300.0,
+        seed: int = 0,
+        sim_start: datetime = SIM_START) -> OrderTable:
+    """Orders replayed from cleaned TLC trips in [start, end).
+
+    Timestamps are the real pickup times as seconds since ``sim_start`` (so
+    time-of-day and weekday features line up with the data), and zones are
+    the real PU/DO zones. ``target_rate`` (orders per hour) thins or
+    replicates trips to that average rate. Trips with zones outside the
+    zone tables (e.g. 264/265, "unknown") are dropped.
+    """
+    pickups, pu_zones, do_zones = read_trip_window(inputs, start, end)
+    valid = (pu_zones >= 1) & (pu_zones < NUM_ZONES) & (do_zones >= 1) & (do_zones < NUM_ZONES)
+    pickups, pu_zones, do_zones = pickups[valid], pu_zones[valid], do_zones[valid]
+    timestamps = (pickups - np.datetime64(sim_start, "us")) / np.timedelta64(1, "s")
+
+    if target_rate is not None and len(timestamps):
+        if target_rate <= 0:
+            raise ValueError("target_rate must be positive")
+        window_start = np.datetime64(start, "us") if start is not None else pickups.min()
+        window_end = np.datetime64(end, "us") if end is not None else pickups.max() + np.timedelta64(1, "s")
+        window_hours = (window_end - window_start) / np.timedelta64(1, "h")
+        factor = target_rate * window_hours / len(timestamps)
+        bounds = (np.array([window_start, window_end]) - np.datetime64(sim_start, "us")) / np.timedelta64(1, "s")
+        rows, timestamps = resample_times(timestamps, factor, np.random.default_rng(seed), jitter_sec, tuple(bounds))
+        pu_zones, do_zones = pu_zones[rows], do_zones[rows]
+
+    order = np.argsort(timestamps, kind="stable")
+    return OrderTable(
+        order_id=np.arange(len(order)),
+        timestamp=timestamps[order],
+        pickup_zone=pu_zones[order],
+        dropoff_zone=do_zones[order],
+    )
+
+
+if __name__ == "__main__":
+    orders = replay_orders(start="2025-06-02 07:00", end="2025-06-02 10:00")
+    hours = orders.timestamp[-1] / 3600 - orders.timestamp[0] / 3600 if len(orders) else 0.0
+    print(f"✅ Replayed {len(orders)} orders over {hours:.1f} h")
@@ -0,0 +1,177 @@
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+MODEL_PATH = Path("models/xgb_eta_model.json")
+DISTANCE_PATH = Path("data/geo/zone_distance_matrix.parquet")
+SPEED_PATH = Path("data/processed/features_yellow_tripdata_2025-06.parquet")
+SPEED_URL = "https://huggingface.co/datasets/Satournine/taxi_trip_data/resolve/main/features_yellow_tripdata_2025-06.parquet"
+ETA_TABLE_PATH = Path("models/eta_table.npy")
+DISTANCE_TABLE_PATH = Path("data/geo/zone_distance_matrix.npy")
+SPEED_TABLE_PATH = Path("data/geo/zone_speed_kmh.npy")
+
+
+@dataclass
+class ResourceConfig:
+    model_path: Path = MODEL_PATH
+    distance_path: Path = DISTANCE_PATH
+    speed_path: Path = SPEED_PATH
+    speed_url: str = SPEED_URL
+    speed_month: str = "2025-06"  # partition read when speed_path is a partitioned features dir
+    distance_table_path: Path = DISTANCE_TABLE_PATH
+    speed_table_path: Path = SPEED_TABLE_PATH
+    eta_table_path: Path = ETA_TABLE_PATH
+    predictor_backend: str = "xgboost"
+    mmap_tables: bool = False
+    backend_options: dict = field(default_factory=dict)
+
+
+def load_model(path: Path):
+    import xgboost as xgb
+
+    model = xgb.XGBRegressor()
+    model.load_model(path)
+    return model
+
+
+def download_speed_data(path: Path, url: str) -> None:
+    import requests
+
+    print("Downloading speed data from Hugging Face...")
+    response = requests.get(url)
+    response.raise_for_status()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(response.content)
+
+
+def load_zone_tables(config: ResourceConfig):
+    """Load the prebuilt zone tables, building any missing one from its source once."""
+    import pandas as pd
+    from src.dispatch import zone_tables
+
+    if not config.distance_table_path.exists():
+        distance_df = pd.read_parquet(config.distance_path)
+        zone_tables.save_table(zone_tables.build_distance_table(distance_df), config.distance_table_path)
+
+    if not config.speed_table_path.exists():
+        columns = ["PULocationID", "DOLocationID", "pickup_hour", "historical_speed_kmh"]
+        if config.speed_path.is_dir():
+            from src.features.make_features import read_feature_partitions
+
+            speed_df = read_feature_partitions(config.speed_path, months=[config.speed_month], columns=columns)
+        else:
+            if not config.speed_path.exists():
+                download_speed_data(config.speed_path, config.speed_url)
+            speed_df = pd.read_parquet(config.speed_path, columns=columns)
+        if speed_df.empty:
+            # An all-NaN table would silently fall back to the default speed on every run.
+            raise ValueError(f"No speed rows in {config.speed_path} for month {config.speed_month}")
+        zone_tables.save_table(zone_tables.build_speed_table(speed_df), config.speed_table_path)
+
+    return zone_tables.load_zone_tables(config.distance_table_path, config.speed_table_path, mmap=config.mmap_tables)
+
+
+def _xgboost_backend(resources: "Resources"):
+    from src.dispatch.predictors import XGBoostETAPredictor
+
+    return XGBoostETAPredictor(resources.model, resources.zone_tables)
+
+
+def _eta_table_backend(resources: "Resources"):
+    from src.dispatch.eta_table import ETATablePredictor, build_eta_table, save_eta_table
+
+    if not resources.config.eta_table_path.exists():
+        save_eta_table(build_eta_table(resources), resources.config.eta_table_path)
+    return ETATablePredictor(resources.config.eta_table_path, **resources.config.backend_options)
+
+
+def _numpy_trees_backend(resources: "Resources"):
+    from src.dispatch.tree_ensemble import TreeEnsemble, TreeEnsembleETAPredictor
+
+    return TreeEnsembleETAPredictor(TreeEnsemble.load(resources.config.model_path), resources.zone_tables)
+
+
+def _http_backend(resources: "Resources"):
+    from src.serving.client import HTTPETAPredictor
+
+    return HTTPETAPredictor(**resources.config.backend_options)
+
+
+PREDICTOR_BACKENDS = {
+    "xgboost": _xgboost_backend,
+    "eta_table": _eta_table_backend,
+    "numpy_trees": _numpy_trees_backend,
+    "http": _http_backend,
+}
+
+
+class Resources:
+    """Model, lookup tables and predictor, each loaded on first access.
+
+    Keyword overrides (model=, zone_tables=, proximity_index=, predictor=)
+    replace the corresponding loader, e.g. to inject small test stand-ins.
+    """
+
+    def __init__(self, config: ResourceConfig = None, **overrides):
+        self.config = config or ResourceConfig()
+        if self.config.predictor_backend not in PREDICTOR_BACKENDS:
+            raise ValueError(f"Unknown predictor backend: {self.config.predictor_backend!r}")
+        self._cache = dict(overrides)
+        self._lock = threading.RLock()
+
+    def _get(self, name, loader):
+        try:
+            return self._cache[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._cache:
+                self._cache[name] = loader()
+            return self._cache[name]
+
+    @property
+    def model(self):
+        return self._get("model", lambda: load_model(self.config.model_path))
+
+    @property
+    def zone_tables(self):
+        return self._get("zone_tables", lambda: load_zone_tables(self.config))
+
+    @property
+    def proximity_index(self):
+        from src.dispatch.proximity import ZoneProximityIndex
+
+        return self._get("proximity_index", lambda: ZoneProximityIndex.from_zone_tables(self.zone_tables))
+
+    @property
+    def predictor(self):
+        build = PREDICTOR_BACKENDS[self.config.predictor_backend]
+        return self._get("predictor", lambda: build(self))
+
+
+_resources = None
+_resources_lock = threading.Lock()
+
+
+def get_resources() -> Resources:
+    """Shared Resources instance, created with the default config on first use."""
+    global _resources
+    if _resources is None:
+        with _resources_lock:
+            if _resources is None:
+                _resources = Resources()
+    return _resources
+
+
+def configure(config: ResourceConfig = None, **overrides) -> Resources:
+    """Replace the shared Resources; nothing is loaded until first use."""
+    return use_resources(Resources(config, **overrides))
+
+
+def use_resources(resources: Resources) -> Resources:
+    """Atomically make ``resources`` the shared instance; runs already in progress keep theirs."""
+    global _resources
+    with _resources_lock:
+        _resources = resources
+    return resources
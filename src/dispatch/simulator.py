@@ -1,36 +1,27 @@
+from array import array
 from dataclasses import dataclass
-from typing import List
+from pathlib import Path
+from typing import AsyncIterable, Iterable, List, Union
+import asyncio
+import heapq
+import math
 import random
-import xgboost as xgb
+import time
 import numpy as np
-import pandas as pd
-from pathlib import Path
-from datetime import datetime, timedelta
-
-model_path = Path("models/xgb_eta_model.json")
-xgb_model = xgb.XGBRegressor()
-xgb_model.load_model(model_path)
-distance_df = pd.read_parquet("data/geo/zone_distance_matrix.parquet")
-import requests
-
-speed_file_path = Path("data/processed/features_yellow_tripdata_2025-06.parquet")
-if not speed_file_path.exists():
-    print("Downloading speed data from Hugging Face...")
-    url = "https://huggingface.co/datasets/Satournine/taxi_trip_data/resolve/main/features_yellow_tripdata_2025-06.parquet"
-    response = requests.get(url)
-    speed_file_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(speed_file_path, "wb") as f:
-        f.write(response.content)
-
-speed_df = pd.read_parquet(speed_file_path)
-@dataclass
+
+from src.dispatch.instrumentation import Instrumentation
+from src.dispatch.metrics import AssignmentLog, ExactMetrics, OnlineMetrics
+from src.dispatch.proximity import CandidatePruning
+from src.dispatch.resources import get_resources
+
+@dataclass(slots=True)
 class Order:
     order_id: int
     timestamp: float
     pickup_zone: int
     dropoff_zone: int
 
-@dataclass
+@dataclass(slots=True)
 class Courier:
     courier_id: int
     current_zone: int
@@ -38,109 +29,529 @@ class Courier:
     total_work_time: float = 0.0
 
 class DispatchSimulator:
-    def __init__(self, couriers: List[Courier], orders: List[Order], eta_predictor):
+    ENGINES = ("event", "scan", "columnar")
+    DISPATCH_MODES = ("greedy", "batch")
+    METRICS_MODES = ("exact", "online")
+
+    def __init__(
+            self,
+            couriers: List[Courier],
+            orders: Union[Iterable[Order], AsyncIterable[Order]],
+            eta_predictor=None,
+            engine: str = "event",
+            pruning: CandidatePruning = None,
+            proximity_index=None,
+            dispatch_mode: str = "greedy",
+            batch_window: float = 30.0,
+            instrumentation: Instrumentation = None,
+            metrics: str = "exact",
+            assignment_log: Path = None):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {self.ENGINES}")
+        if dispatch_mode not in self.DISPATCH_MODES:
+            raise ValueError(f"Unknown dispatch mode {dispatch_mode!r}, expected one of {self.DISPATCH_MODES}")
+        if dispatch_mode == "batch" and batch_window <= 0:
+            raise ValueError("batch_window must be positive")
+        if pruning is not None and engine != "event":
+            raise ValueError("Candidate pruning requires the event engine")
+        if engine == "columnar" and dispatch_mode != "greedy":
+            raise ValueError("The columnar engine supports greedy dispatch only")
+        if metrics not in self.METRICS_MODES:
+            raise ValueError(f"Unknown metrics mode {metrics!r}, expected one of {self.METRICS_MODES}")
+        from src.dispatch.columnar import Fleet
+
         self.couriers = couriers
         self.orders = orders
+        self.fleet = None
+        self._source_fleet = None
+        if engine == "columnar":
+            # Courier state lives in NumPy arrays during the run; Courier
+            # objects passed in are updated from them when it finishes.
+            self.fleet = couriers if isinstance(couriers, Fleet) else Fleet.from_couriers(couriers)
+        elif isinstance(couriers, Fleet):
+            # Indexing a Fleet yields snapshots, which the object engines
+            # would update in vain: run on Courier objects and copy their
+            # state back into the fleet when the run finishes.
+            self._source_fleet = couriers
+            self.couriers = list(couriers)
+        # eta_predictor(order, current_time, courier_zones) -> total ETA per courier.
+        # Wrap per-courier predictors like predict_eta with batch_from_scalar.
+        # Batch dispatch uses eta_predictor.eta_matrix when the predictor has one.
+        # The shared predictor (None or predict_eta_batch) is resolved once per
+        # run, so activating another model never changes it mid-run.
+        self._shared_predictor = eta_predictor is None or eta_predictor is predict_eta_batch
+        if self._shared_predictor:
+            eta_predictor = predict_eta_batch
+            self.eta_matrix = predict_eta_matrix
+        else:
+            self.eta_matrix = getattr(eta_predictor, "eta_matrix", None) or self._stacked_eta_matrix
         self.eta_predictor = eta_predictor
-        self.assignments = []
-        self.eta_log = []
-        self.queued_orders = []
+        self.dispatch_mode = dispatch_mode
+        self.batch_window = batch_window
+        self.engine = engine
+        self.pruning = pruning
+        self.proximity_index = proximity_index
+        # Optional sink for phase timings, counters and latency histograms;
+        # with None every hook is a single attribute check.
+        self.instrumentation = instrumentation
+        self.pruning_stats = {
+            "pruned_orders": 0,
+            "fallback_orders": 0,
+            "candidates_scored": 0,
+            "audited_orders": 0,
+            "changed_choice": 0,
+        }
+        # "exact" keeps every assignment, ETA and queued order in memory;
+        # "online" keeps only running metrics, so memory stays bounded by the
+        # fleet however many orders stream through. Either way the full
+        # assignment log can be spilled to a parquet file.
+        self.metrics_mode = metrics
+        if metrics == "exact" and engine == "columnar":
+            from src.dispatch.columnar import AssignmentColumns
+
+            self.metrics = ExactMetrics(array("d"))
+            self.assignments = AssignmentColumns()
+            self.eta_log = self.metrics.etas
+            self.queued_orders = []
+        elif metrics == "exact":
+            self.metrics = ExactMetrics()
+            self.assignments = []
+            self.eta_log = self.metrics.etas
+            self.queued_orders = []
+        else:
+            self.metrics = OnlineMetrics()
+            self.assignments = None
+            self.eta_log = None
+            self.queued_orders = None
+        self.assignment_log = AssignmentLog(assignment_log) if assignment_log is not None else None
+        self.orders_seen = 0
+        self.num_queued = 0
+        self.wall_clock_sec = 0.0
 
     def run(self):
-        for order in self.orders:
+        """Dispatch every order; async order sources are consumed with run_async."""
+        if hasattr(self.orders, "__aiter__"):
+            asyncio.run(self.run_async())
+        else:
+            self._execute(iter(self.orders))
+
+    async def run_async(self):
+        """Dispatch orders from an async iterator as they arrive.
+
+        The engine runs in a worker thread and pulls each order from the
+        event loop, so report_metrics() can be called from the loop mid-run.
+        """
+        if not hasattr(self.orders, "__aiter__"):
+            await asyncio.to_thread(self._execute, iter(self.orders))
+            return
+        orders = _iter_async(self.orders, asyncio.get_running_loop())
+        await asyncio.to_thread(self._execute, orders)
+
+    def _execute(self, orders):
+        started = time.perf_counter()
+        if self._shared_predictor:
+            predictor = get_resources().predictor
+            self.eta_predictor = predictor
+            self.eta_matrix = getattr(predictor, "eta_matrix", None) or self._stacked_eta_matrix
+        try:
+            if self.instrumentation is None:
+                self._run(orders)
+            else:
+                with self.instrumentation.activate():
+                    self._run(orders)
+        finally:
+            if self._source_fleet is not None:
+                self._source_fleet.update_from(self.couriers)
+            if self.assignment_log is not None:
+                self.assignment_log.close()
+        self.wall_clock_sec = time.perf_counter() - started
+        if self.instrumentation is not None:
+            self.instrumentation.add_phase("run", self.wall_clock_sec)
+
+    def _run(self, orders):
+        if self.dispatch_mode == "batch":
+            self._run_batch(orders)
+        elif self.engine == "event":
+            self._run_event(orders)
+        elif self.engine == "columnar":
+            self._run_columnar(orders)
+        else:
+            self._run_scan(orders)
+
+    def _run_scan(self, orders):
+        """Reference engine: scans the whole fleet for every order."""
+        inst = self.instrumentation
+        for order in orders:
+            self.orders_seen += 1
+            started = time.perf_counter() if inst is not None else 0.0
             available = [c for c in self.couriers if c.available_at <= order.timestamp]
             if not available:
-                self.queued_orders.append(order)
+                self._queue(order)
+                if inst is not None:
+                    self._record_decision(order, started, assigned=False)
                 continue
+            if inst is not None:
+                inst.add_phase("candidate_filtering", time.perf_counter() - started)
+            best_idx, best_eta = self._pick_best(order, available)
+            self._assign(order, available[best_idx], best_eta)
+            if inst is not None:
+                self._record_decision(order, started, assigned=True)
+
+    def _run_event(self, orders):
+        """Event-driven engine.
+
+        Order arrivals are taken in timestamp order and merged with a heap of
+        courier-free events; couriers whose free time has passed move to an
+        idle set, so each order only touches the idle candidates. Candidates
+        are scored in fleet order, which keeps ties (and therefore every
+        assignment) identical to the scan engine.
+        """
+        busy = [(c.available_at, idx) for idx, c in enumerate(self.couriers)]
+        heapq.heapify(busy)
+        idle = set()
+        idle_by_zone = {}
+        if self.pruning is not None and self.proximity_index is None:
+            self.proximity_index = get_resources().proximity_index
+        last_timestamp = float("-inf")
+        inst = self.instrumentation
+
+        for order in orders:
+            self.orders_seen += 1
+            started = time.perf_counter() if inst is not None else 0.0
+            if order.timestamp < last_timestamp:
+                raise ValueError(
+                    f"Order {order.order_id} arrives before the previous order; "
+                    "the event engine needs orders sorted by timestamp"
+                )
+            last_timestamp = order.timestamp
+
+            while busy and busy[0][0] <= order.timestamp:
+                idx = heapq.heappop(busy)[1]
+                idle.add(idx)
+                idle_by_zone.setdefault(self.couriers[idx].current_zone, set()).add(idx)
+            if not idle:
+                self._queue(order)
+                if inst is not None:
+                    self._record_decision(order, started, assigned=False)
+                continue
+
+            if self.pruning is None:
+                candidates = sorted(idle)
+            else:
+                candidates = self._nearby_candidates(order, idle, idle_by_zone)
+            if inst is not None:
+                inst.add_phase("candidate_filtering", time.perf_counter() - started)
+                inst.gauge("idle_couriers", order.timestamp, len(idle))
+            best_pos, best_eta = self._pick_best(order, [self.couriers[idx] for idx in candidates])
+            best = candidates[best_pos]
+
+            if self.pruning is not None and self.pruning.audit:
+                exhaustive = sorted(idle)
+                exhaustive_pos, _ = self._pick_best(order, [self.couriers[idx] for idx in exhaustive])
+                self.pruning_stats["audited_orders"] += 1
+                if exhaustive[exhaustive_pos] != best:
+                    self.pruning_stats["changed_choice"] += 1
+
+            idle.discard(best)
+            idle_by_zone[self.couriers[best].current_zone].discard(best)
+            self._assign(order, self.couriers[best], best_eta)
+            heapq.heappush(busy, (self.couriers[best].available_at, best))
+            if inst is not None:
+                self._record_decision(order, started, assigned=True)
+
+    def _run_columnar(self, orders):
+        """Struct-of-arrays engine.
+
+        Availability is a mask over the fleet's available_at array and the
+        candidates are its indices in fleet order, so ties and assignments
+        match the scan and event engines exactly.
+        """
+        fleet = self.fleet
+        inst = self.instrumentation
+        try:
+            for order in orders:
+                self.orders_seen += 1
+                started = time.perf_counter() if inst is not None else 0.0
+                available = np.flatnonzero(fleet.available_at <= order.timestamp)
+                if not len(available):
+                    self._queue(order)
+                    if inst is not None:
+                        self._record_decision(order, started, assigned=False)
+                    continue
+                if inst is not None:
+                    inst.add_phase("candidate_filtering", time.perf_counter() - started)
+                    inst.gauge("idle_couriers", order.timestamp, len(available))
+
+                best_pos, eta = self._pick_best_zone(order, fleet.current_zone[available])
+                best = available[best_pos]
+                fleet.total_work_time[best] += eta
+                fleet.available_at[best] = order.timestamp + eta
+                fleet.current_zone[best] = order.dropoff_zone
+                self._log_assignment(order.order_id, int(fleet.courier_id[best]), eta)
+                if inst is not None:
+                    self._record_decision(order, started, assigned=True)
+        finally:
+            if self.couriers is not fleet:
+                fleet.write_back(self.couriers)
+
+    def _run_batch(self, orders):
+        """Windowed global matching.
 
-            best_eta = float("inf")
-            best_courier = None
+        Orders are buffered for ``batch_window`` seconds. At the end of each
+        window the idle couriers and buffered orders are matched by a
+        min-cost assignment over one courier x order ETA matrix; unmatched
+        orders carry over to the next window. The logged ETA includes the
+        time an order waited in the buffer.
+        """
+        from scipy.optimize import linear_sum_assignment
 
-            for courier in available:
-                to_pickup_eta = self.eta_predictor(order, order.timestamp, courier.current_zone)
-                trip_eta = self.eta_predictor(order, order.timestamp, order.pickup_zone)
-                total_eta = to_pickup_eta + trip_eta
+        if not self.couriers:
+            for order in orders:
+                self.orders_seen += 1
+                self._queue(order)
+            return
+
+        busy = [(c.available_at, idx) for idx, c in enumerate(self.couriers)]
+        heapq.heapify(busy)
+        idle = set()
+        pending = []
+        next_order = next(orders, None)
+        window_end = next_order.timestamp + self.batch_window if next_order is not None else 0.0
+        inst = self.instrumentation
+
+        while next_order is not None or pending:
+            started = time.perf_counter() if inst is not None else 0.0
+            while next_order is not None and next_order.timestamp < window_end:
+                if pending and next_order.timestamp < pending[-1].timestamp:
+                    raise ValueError(
+                        f"Order {next_order.order_id} arrives before the previous order; "
+                        "batch dispatch needs orders sorted by timestamp"
+                    )
+                pending.append(next_order)
+                self.orders_seen += 1
+                next_order = next(orders, None)
+            while busy and busy[0][0] <= window_end:
+                idle.add(heapq.heappop(busy)[1])
+
+            if inst is not None:
+                inst.gauge("pending_orders", window_end, len(pending))
+            if pending and idle:
+                candidates = sorted(idle)
+                zones = np.array([self.couriers[idx].current_zone for idx in candidates])
+                if inst is not None:
+                    inst.add_phase("candidate_filtering", time.perf_counter() - started)
+                    predict_started = time.perf_counter()
+                cost = np.asarray(self.eta_matrix(pending, window_end, zones))
+                if inst is not None:
+                    matching_started = time.perf_counter()
+                    inst.add_phase("eta_prediction", matching_started - predict_started)
+                    inst.count("predictor_calls")
+                    inst.count("candidates_scored", cost.size)
+                rows, cols = linear_sum_assignment(cost)
+                if inst is not None:
+                    bookkeeping_started = time.perf_counter()
+                    inst.add_phase("matching", bookkeeping_started - matching_started)
+
+                matched = set()
+                for row, col in sorted(zip(rows, cols), key=lambda rc: rc[1]):
+                    order = pending[col]
+                    courier = self.couriers[candidates[row]]
+                    travel_eta = float(cost[row, col])
+                    courier.total_work_time += travel_eta
+                    courier.available_at = window_end + travel_eta
+                    courier.current_zone = order.dropoff_zone
+                    eta = (window_end - order.timestamp) + travel_eta
+                    self._log_assignment(order.order_id, courier.courier_id, eta)
+                    idle.discard(candidates[row])
+                    heapq.heappush(busy, (courier.available_at, candidates[row]))
+                    matched.add(col)
+                pending = [order for col, order in enumerate(pending) if col not in matched]
+                if inst is not None:
+                    inst.add_phase("bookkeeping", time.perf_counter() - bookkeeping_started)
+                    inst.count("orders_assigned", len(matched))
+                    inst.count("windows_matched")
+                    inst.observe("decision_latency_ms", (time.perf_counter() - started) * 1e3)
+
+            # Skip windows in which nothing can happen.
+            next_end = window_end + self.batch_window
+            if pending and not idle:
+                next_event = busy[0][0]
+            elif not pending and next_order is not None:
+                next_event = next_order.timestamp
+            else:
+                next_event = next_end
+            if next_event >= next_end:
+                skipped = math.floor((next_event - window_end) / self.batch_window)
+                next_end = window_end + self.batch_window * (skipped + 1)
+            window_end = next_end
+
+    def _stacked_eta_matrix(self, orders, current_time, courier_zones) -> np.ndarray:
+        return np.column_stack([self.eta_predictor(order, current_time, courier_zones) for order in orders])
+
+    def _nearby_candidates(self, order, idle, idle_by_zone) -> List[int]:
+        candidates = []
+        for zone in self.proximity_index.nearby(order.pickup_zone, self.pruning.max_radius_km):
+            bucket = idle_by_zone.get(zone)
+            if bucket:
+                candidates.extend(bucket)
+                if len(candidates) >= self.pruning.k:
+                    break
+
+        if candidates:
+            self.pruning_stats["pruned_orders"] += 1
+        else:
+            self.pruning_stats["fallback_orders"] += 1
+            candidates = idle
+        self.pruning_stats["candidates_scored"] += len(candidates)
+        return sorted(candidates)
+
+    def _pick_best(self, order, available: List[Courier]):
+        return self._pick_best_zone(order, np.array([c.current_zone for c in available]))
+
+    def _pick_best_zone(self, order, courier_zones: np.ndarray):
+        inst = self.instrumentation
+        if inst is not None:
+            started = time.perf_counter()
+        total_etas = self.eta_predictor(order, order.timestamp, courier_zones)
+        best_idx = int(np.argmin(total_etas))
+        if inst is not None:
+            inst.add_phase("eta_prediction", time.perf_counter() - started)
+            inst.count("predictor_calls")
+            inst.count("candidates_scored", len(courier_zones))
+            inst.observe("candidates_per_order", len(courier_zones))
+        return best_idx, float(total_etas[best_idx])
+
+    def _assign(self, order, courier: Courier, eta: float):
+        if self.instrumentation is not None:
+            started = time.perf_counter()
+        courier.total_work_time += eta
+        courier.available_at = order.timestamp + eta
+        courier.current_zone = order.dropoff_zone
+        self._log_assignment(order.order_id, courier.courier_id, eta)
+        if self.instrumentation is not None:
+            self.instrumentation.add_phase("bookkeeping", time.perf_counter() - started)
+
+    def _log_assignment(self, order_id: int, courier_id: int, eta: float):
+        self.metrics.add(eta)
+        if self.assignments is not None:
+            self.assignments.append((order_id, courier_id, eta))
+        if self.assignment_log is not None:
+            self.assignment_log.append(order_id, courier_id, eta)
 
-                if total_eta < best_eta:
-                    best_eta = total_eta
-                    best_courier = courier
+    def _queue(self, order):
+        self.num_queued += 1
+        if self.queued_orders is not None:
+            self.queued_orders.append(order)
 
-            if best_courier:
-                best_courier.total_work_time += best_eta
-                best_courier.available_at = order.timestamp + best_eta
-                best_courier.current_zone = order.dropoff_zone
-                self.assignments.append((order.order_id, best_courier.courier_id, best_eta))
-                self.eta_log.append(best_eta)
+    def _record_decision(self, order, started: float, assigned: bool):
+        inst = self.instrumentation
+        inst.observe("decision_latency_ms", (time.perf_counter() - started) * 1e3)
+        inst.count("orders_assigned" if assigned else "orders_queued")
+        inst.gauge("queued_orders", order.timestamp, self.num_queued)
 
     def report_metrics(self):
-        if not self.assignments:
+        """Metrics over the orders seen so far; safe to call while a run is in progress."""
+        if not self.metrics.count:
             print("No orders were assigned.")
             return
 
-        etas = np.array(self.eta_log)
-        end_times = [c.available_at for c in self.couriers if c.available_at > 0]
-        total_sim_time = max(end_times) if end_times else 1.0
-        avg_eta = np.mean(etas)
-        p50 = np.percentile(etas, 50)
-        p90 = np.percentile(etas, 90)
-        utilization = [c.total_work_time / total_sim_time for c in self.couriers]
-        queued_orders = len(self.queued_orders)
-        queued_ratio = queued_orders / len(self.orders)
+        if self.fleet is not None:
+            end_times = self.fleet.available_at[self.fleet.available_at > 0]
+            total_sim_time = float(end_times.max()) if len(end_times) else 1.0
+            utilization = (self.fleet.total_work_time / total_sim_time).tolist()
+        else:
+            end_times = [c.available_at for c in self.couriers if c.available_at > 0]
+            total_sim_time = max(end_times) if end_times else 1.0
+            utilization = [c.total_work_time / total_sim_time for c in self.couriers]
+        queued_ratio = self.num_queued / self.orders_seen
 
         return{
-            "avg_eta": avg_eta,
-            "p50": p50,
-            "p90": p90,
+            **self.metrics.summary(),
             "utilization": utilization,
-            "queued_orders": len(self.queued_orders),
-            "queued_ratio": queued_ratio
+            "queued_orders": self.num_queued,
+            "queued_ratio": queued_ratio,
+            "assigned_orders": self.metrics.count,
         }
 
-distance_lookup = distance_df.set_index(["PULocationID", "DOLocationID"])["great_circle_km"].to_dict()
-speed_lookup = (
-    speed_df.groupby(["PULocationID", "DOLocationID", "pickup_hour"])["historical_speed_kmh"]
-    .median()
-    .to_dict()
-)
+# Backwards-compatible module attributes, loaded on first access.
+_LAZY_RESOURCES = {
+    "xgb_model": "model",
+    "zone_tables": "zone_tables",
+}
+
+def __getattr__(name):
+    if name in _LAZY_RESOURCES:
+        return getattr(get_resources(), _LAZY_RESOURCES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _iter_async(orders, loop):
+    """Blocking iterator over an async iterator that lives on ``loop``."""
+    iterator = orders.__aiter__()
+    done = object()
+
+    async def next_order():
+        try:
+            return await iterator.__anext__()
+        except StopAsyncIteration:
+            return done
+
+    while True:
+        order = asyncio.run_coroutine_threadsafe(next_order(), loop).result()
+        if order is done:
+            return
+        yield order
 
 def predict_eta(order, current_time, courier_zone):
-    pu = order.pickup_zone
-    do = order.dropoff_zone
-    dt = datetime(2025, 6, 1) + timedelta(seconds=current_time)
-    hour = dt.hour
-    weekday = dt.weekday()
-    is_weekend = weekday >= 5
-    month = dt.month
-    distance_km = distance_lookup.get((pu, do), 5.0)
-    historical_speed = speed_lookup.get((pu, do, hour), 20.0)
-
-    features = pd.DataFrame([{
-        "great_circle_km": distance_km,
-        "pickup_hour": hour,
-        "pickup_weekday": weekday,
-        "is_weekend": is_weekend,
-        "pickup_month": month,
-        "historical_speed_kmh": historical_speed,
-    }])
-
-    log_eta_pred = xgb_model.predict(features)[0]
-    eta = np.expm1(log_eta_pred)
-    return eta
-
-def initialize_couriers(n: int, zone_ids: List[int]) -> List[Courier]:
-    return [Courier(courier_id=i, current_zone=random.choice(zone_ids), available_at=0.0) for i in range(n)]
-
-def generate_fake_orders(n: int, zone_ids: List[int], start_time=0.0, interval=60.0) -> List[Order]:
-    orders = []
-    time = start_time
-    for i in range(n):
-        pu = random.choice(zone_ids)
-        do = random.choice(zone_ids)
-        while do == pu:
-            do = random.choice(zone_ids)
-        orders.append(Order(order_id=i, timestamp=time, pickup_zone=pu, dropoff_zone=do))
-        time += interval
-    return orders
+    return get_resources().predictor.leg_etas([order.pickup_zone], [order.dropoff_zone], current_time)[0]
+
+def predict_eta_batch(order, current_time, courier_zones) -> np.ndarray:
+    """Total ETA (courier -> pickup -> dropoff) for every candidate courier zone,
+    using the predictor backend of the shared resources."""
+    return get_resources().predictor(order, current_time, courier_zones)
+
+def predict_eta_matrix(orders, current_time, courier_zones) -> np.ndarray:
+    """Total ETA for every (courier, order) pair, shape (len(courier_zones), len(orders))."""
+    return get_resources().predictor.eta_matrix(orders, current_time, courier_zones)
+
+def batch_from_scalar(eta_predictor):
+    """Adapt a per-courier predictor(order, current_time, courier_zone) to the batch API."""
+    def batch_predictor(order, current_time, courier_zones):
+        trip_eta = eta_predictor(order, current_time, order.pickup_zone)
+        return np.array([
+            eta_predictor(order, current_time, zone) + trip_eta
+            for zone in courier_zones
+        ])
+    return batch_predictor
+
+def initialize_couriers(n: int, zone_ids: List[int], rng: random.Random = None) -> List[Courier]:
+    rng = rng or random
+    return [Courier(courier_id=i, current_zone=rng.choice(zone_ids), available_at=0.0) for i in range(n)]
+
+def numpy_rng(rng=None) -> np.random.Generator:
+    """NumPy generator from a Generator, a random.Random, or None (seeded from ``random``)."""
+    if isinstance(rng, np.random.Generator):
+        return rng
+    return np.random.default_rng((rng or random).getrandbits(64))
+
+def generate_fake_orders(n: int, zone_ids: List[int], start_time=0.0, interval=60.0, rng=None):
+    """``n`` orders every ``interval`` seconds between uniformly drawn, distinct zones.
+
+    Returns an OrderTable, which indexes and iterates like a list of Order.
+    """
+    from src.dispatch.columnar import OrderTable
+
+    rng = numpy_rng(rng)
+    zone_ids = np.asarray(zone_ids)
+    pu_idx = rng.integers(0, len(zone_ids), n)
+    # Uniform over the other zones: draw from len - 1 and skip past the pickup.
+    do_idx = rng.integers(0, len(zone_ids) - 1, n)
+    do_idx += do_idx >= pu_idx
+    return OrderTable(
+        order_id=np.arange(n),
+        timestamp=start_time + interval * np.arange(n, dtype=np.float64),
+        pickup_zone=zone_ids[pu_idx],
+        dropoff_zone=zone_ids[do_idx],
+    )
 
 if __name__ == "__main__":
     NUM_COURIERS = 2
@@ -151,7 +562,7 @@ if __name__ == "__main__":
     couriers = initialize_couriers(NUM_COURIERS, zone_ids)
     orders = generate_fake_orders(NUM_ORDERS, zone_ids, interval=INTERVAL)
 
-    sim = DispatchSimulator(couriers, orders, predict_eta)
+    sim = DispatchSimulator(couriers, orders, predict_eta_batch)
     sim.run()
 
     print("\nAssignments:")
@@ -0,0 +1,106 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from itertools import product
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from src.dispatch import resources
+from src.dispatch.simulator import DispatchSimulator, generate_fake_orders, initialize_couriers
+
+ZONE_IDS = list(range(1, 264))
+METRIC_COLUMNS = ["avg_eta", "p50", "p90", "mean_utilization", "queued_ratio", "assigned_orders", "wall_clock_sec"]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    num_couriers: int
+    num_orders: int
+    interval: float
+
+
+def scenario_grid(num_couriers, num_orders, intervals) -> List[Scenario]:
+    return [Scenario(c, o, i) for c, o, i in product(num_couriers, num_orders, intervals)]
+
+
+def run_scenario(scenario: Scenario, seed: int) -> dict:
+    """One simulation run; couriers and orders are drawn from ``random.Random(seed)``."""
+    rng = random.Random(seed)
+    couriers = initialize_couriers(scenario.num_couriers, ZONE_IDS, rng=rng)
+    orders = generate_fake_orders(scenario.num_orders, ZONE_IDS, interval=scenario.interval, rng=rng)
+
+    sim = DispatchSimulator(couriers, orders)
+    sim.run()
+    metrics = sim.report_metrics() or {
+        "avg_eta": np.nan, "p50": np.nan, "p90": np.nan, "utilization": [0.0],
+        "queued_ratio": sim.num_queued / max(sim.orders_seen, 1), "assigned_orders": 0,
+    }
+    return {
+        **asdict(scenario),
+        "seed": seed,
+        "avg_eta": float(metrics["avg_eta"]),
+        "p50": float(metrics["p50"]),
+        "p90": float(metrics["p90"]),
+        "mean_utilization": float(np.mean(metrics["utilization"])),
+        "queued_ratio": float(metrics["queued_ratio"]),
+        "assigned_orders": int(metrics["assigned_orders"]),
+        "wall_clock_sec": sim.wall_clock_sec,
+    }
+
+
+def _init_worker(config: resources.ResourceConfig) -> None:
+    # Tables are opened with mmap_mode="r", so every worker reads the same
+    # page-cache copy instead of holding its own.
+    resources.configure(config)
+
+
+def _run_one(args) -> dict:
+    return run_scenario(*args)
+
+
+def run_sweep(
+        scenarios: List[Scenario],
+        seeds: List[int],
+        max_workers: int = None,
+        config: resources.ResourceConfig = None) -> pd.DataFrame:
+    """Run every (scenario, seed) pair across a process pool, one row per run.
+
+    Missing lookup artifacts are built once in the parent before the pool
+    starts, then workers memory-map them read-only. The caller's shared
+    resources are left as they were.
+    """
+    config = replace(config or resources.ResourceConfig(predictor_backend="eta_table"), mmap_tables=True)
+    resources.Resources(config).predictor
+
+    jobs = [(scenario, seed) for scenario in scenarios for seed in seeds]
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(config,)) as pool:
+        rows = list(pool.map(_run_one, jobs, chunksize=max(1, len(jobs) // (8 * (max_workers or 8)))))
+    return pd.DataFrame(rows)
+
+
+def summarize_sweep(runs: pd.DataFrame, confidence: float = 0.95) -> pd.DataFrame:
+    """Mean and Student-t confidence interval of each metric per scenario."""
+    from scipy import stats
+
+    keys = ["num_couriers", "num_orders", "interval"]
+    grouped = runs.groupby(keys)[METRIC_COLUMNS]
+    mean = grouped.mean()
+    sem = grouped.sem()
+    n = grouped.size()
+    t_crit = stats.t.ppf((1 + confidence) / 2, np.maximum(n - 1, 1))
+    half_width = sem.mul(t_crit, axis=0)
+
+    summary = pd.DataFrame({"runs": n})
+    for metric in METRIC_COLUMNS:
+        summary[f"{metric}_mean"] = mean[metric]
+        summary[f"{metric}_ci_low"] = mean[metric] - half_width[metric]
+        summary[f"{metric}_ci_high"] = mean[metric] + half_width[metric]
+    return summary.reset_index()
+
+
+if __name__ == "__main__":
+    scenarios = scenario_grid(num_couriers=[5, 20, 50], num_orders=[500], intervals=[10.0, 60.0])
+    runs = run_sweep(scenarios, seeds=list(range(20)))
+    print(summarize_sweep(runs).to_string(index=False))
@@ -0,0 +1,160 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.dispatch.predictors import FEATURE_COLUMNS, XGBoostETAPredictor, time_feature_arrays, time_features
+
+SUPPORTED_OBJECTIVES = {"reg:squarederror", "reg:squaredlogerror", "reg:pseudohubererror", "reg:absoluteerror"}
+
+
+def _parse_base_score(raw: str) -> float:
+    return float(raw.strip("[]").split(",")[0])
+
+
+class TreeEnsemble:
+    """XGBoost gbtree regression model evaluated with NumPy only.
+
+    All trees are flattened into shared node arrays (feature index,
+    threshold, children, default direction, leaf value). Batches advance
+    every (row, tree) pair one level per step; single rows walk the trees
+    in plain Python, which has no per-call NumPy overhead.
+    """
+
+    def __init__(self, feature_names, base_score, roots, feature, threshold, left, right, default_left, value, max_depth):
+        self.feature_names = list(feature_names)
+        self.base_score = base_score
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.max_depth = max_depth
+        self.children = np.stack([left, right], axis=1).ravel()  # [left, right] per node
+        # Python lists make the single-row walk several times faster than array indexing.
+        self._nodes = list(zip(
+            feature.tolist(), threshold.tolist(), left.tolist(), right.tolist(), default_left.tolist(), value.tolist()
+        ))
+        self._roots = roots.tolist()
+
+    @classmethod
+    def load(cls, path: Path) -> "TreeEnsemble":
+        with open(path) as f:
+            learner = json.load(f)["learner"]
+
+        objective = learner["objective"]["name"]
+        if objective not in SUPPORTED_OBJECTIVES:
+            raise ValueError(f"Unsupported objective {objective!r}; only identity-link regression is supported")
+        booster = learner["gradient_booster"]
+        if booster["name"] != "gbtree":
+            raise ValueError(f"Unsupported booster {booster['name']!r}")
+
+        trees = booster["model"]["trees"]
+        roots, feature, threshold, left, right, default_left, value = [], [], [], [], [], [], []
+        offset, max_depth = 0, 0
+        for tree in trees:
+            if any(split_type != 0 for split_type in tree["split_type"]):
+                raise ValueError("Categorical splits are not supported")
+            tree_left = np.asarray(tree["left_children"], dtype=np.int32)
+            tree_right = np.asarray(tree["right_children"], dtype=np.int32)
+            is_leaf = tree_left == -1
+
+            roots.append(offset)
+            feature.append(np.where(is_leaf, 0, tree["split_indices"]))
+            # Leaves point at themselves so level-wise traversal can run a fixed number of steps.
+            own_index = np.arange(len(tree_left), dtype=np.int32) + offset
+            left.append(np.where(is_leaf, own_index, tree_left + offset))
+            right.append(np.where(is_leaf, own_index, tree_right + offset))
+            threshold.append(tree["split_conditions"])
+            default_left.append(tree["default_left"])
+            value.append(np.where(is_leaf, tree["split_conditions"], 0.0))
+            max_depth = max(max_depth, _tree_depth(tree_left, tree_right))
+            offset += len(tree_left)
+
+        return cls(
+            feature_names=learner["feature_names"],
+            base_score=_parse_base_score(learner["learner_model_param"]["base_score"]),
+            roots=np.asarray(roots, dtype=np.int32),
+            feature=np.concatenate(feature).astype(np.int32),
+            threshold=np.concatenate(threshold).astype(np.float32),
+            left=np.concatenate(left).astype(np.int32),
+            right=np.concatenate(right).astype(np.int32),
+            default_left=np.concatenate(default_left).astype(bool),
+            value=np.concatenate(value).astype(np.float32),
+            max_depth=max_depth,
+        )
+
+    def predict(self, X) -> np.ndarray:
+        """Raw predictions for a DataFrame (columns by name) or a 2-D array (model column order)."""
+        if isinstance(X, pd.DataFrame):
+            X = X[self.feature_names].to_numpy(dtype=np.float32)
+        X = np.asarray(X, dtype=np.float32)
+        if len(X) == 1:
+            return np.array([self.predict_one(X[0])], dtype=np.float32)
+
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        row_offsets = (np.arange(n_rows, dtype=np.int64) * n_features)[:, None]
+        nodes = np.broadcast_to(self.roots, (n_rows, len(self.roots))).astype(np.int64)
+        for _ in range(self.max_depth):
+            x = flat_X.take(row_offsets + self.feature.take(nodes))
+            go_left = (x < self.threshold.take(nodes)) | (np.isnan(x) & self.default_left.take(nodes))
+            nodes = self.children.take(2 * nodes + ~go_left)
+
+        margin = self.value.take(nodes).sum(axis=1, dtype=np.float64) + self.base_score
+        return margin.astype(np.float32)
+
+    def predict_one(self, row) -> float:
+        row = [float(v) for v in row]
+        nodes = self._nodes
+        total = 0.0
+        for node in self._roots:
+            feature, threshold, left, right, default_left, value = nodes[node]
+            while left != node:
+                x = row[feature]
+                if x != x:  # NaN
+                    node = left if default_left else right
+                else:
+                    node = left if x < threshold else right
+                feature, threshold, left, right, default_left, value = nodes[node]
+            total += value
+        return float(np.float32(total + self.base_score))
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth, level = 0, [0]
+    while level:
+        children = [c for node in level for c in (left[node], right[node]) if c != -1]
+        if children:
+            depth += 1
+        level = children
+    return depth
+
+
+class TreeEnsembleETAPredictor(XGBoostETAPredictor):
+    """Batch eta_predictor on a TreeEnsemble; needs no xgboost install."""
+
+    def __init__(self, ensemble: TreeEnsemble, zone_tables):
+        if ensemble.feature_names != FEATURE_COLUMNS:
+            raise ValueError(f"Model features {ensemble.feature_names} do not match {FEATURE_COLUMNS}")
+        super().__init__(ensemble, zone_tables)
+
+    def leg_features(self, pu_zones, do_zones, current_time) -> np.ndarray:
+        if np.ndim(current_time) == 0:
+            hour, weekday, is_weekend, month = time_features(current_time)
+        else:
+            hour, weekday, is_weekend, month = time_feature_arrays(current_time)
+        pu_zones = np.asarray(pu_zones)
+        do_zones = np.asarray(do_zones)
+
+        features = np.empty((len(pu_zones), len(FEATURE_COLUMNS)), dtype=np.float32)
+        features[:, 0] = self.zone_tables.distance_km(pu_zones, do_zones)
+        features[:, 1] = hour
+        features[:, 2] = weekday
+        features[:, 3] = is_weekend
+        features[:, 4] = month
+        features[:, 5] = self.zone_tables.speed_kmh(pu_zones, do_zones, hour)
+        return features
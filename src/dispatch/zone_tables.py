@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from src.dispatch.resources import DISTANCE_TABLE_PATH, SPEED_TABLE_PATH
+
+NUM_ZONES = 264  # zone ids 1..263 index directly, row 0 is unused
+NUM_HOURS = 24
+DEFAULT_DISTANCE_KM = 5.0
+DEFAULT_SPEED_KMH = 20.0
+
+
+class ZoneTables:
+    """Dense float32 distance (PU x DO) and median speed (PU x DO x hour) tables.
+
+    Missing cells are NaN and resolve to the 5.0 km / 20 km/h defaults.
+    Lookups take scalars or arrays of zones and hours.
+    """
+
+    def __init__(self, distance: np.ndarray, speed: np.ndarray):
+        if distance.shape != (NUM_ZONES, NUM_ZONES):
+            raise ValueError(f"distance table must be {(NUM_ZONES, NUM_ZONES)}, got {distance.shape}")
+        if speed.shape != (NUM_ZONES, NUM_ZONES, NUM_HOURS):
+            raise ValueError(f"speed table must be {(NUM_ZONES, NUM_ZONES, NUM_HOURS)}, got {speed.shape}")
+        self.distance = distance
+        self.speed = speed
+
+    def distance_km(self, pu_zones, do_zones) -> np.ndarray:
+        km = self.distance[pu_zones, do_zones]
+        return np.where(np.isnan(km), np.float32(DEFAULT_DISTANCE_KM), km)
+
+    def speed_kmh(self, pu_zones, do_zones, hours) -> np.ndarray:
+        kmh = self.speed[pu_zones, do_zones, hours]
+        return np.where(np.isnan(kmh), np.float32(DEFAULT_SPEED_KMH), kmh)
+
+
+def build_distance_table(distance_df: pd.DataFrame) -> np.ndarray:
+    table = np.full((NUM_ZONES, NUM_ZONES), np.nan, dtype=np.float32)
+    df = distance_df[(distance_df["PULocationID"] < NUM_ZONES) & (distance_df["DOLocationID"] < NUM_ZONES)]
+    table[df["PULocationID"].to_numpy(), df["DOLocationID"].to_numpy()] = df["great_circle_km"].to_numpy()
+    return table
+
+
+def build_speed_table(speed_df: pd.DataFrame) -> np.ndarray:
+    """Median historical_speed_kmh per (PU, DO, pickup_hour) as a dense table."""
+    df = speed_df[(speed_df["PULocationID"] < NUM_ZONES) & (speed_df["DOLocationID"] < NUM_ZONES)]
+    medians = (
+        df.groupby(["PULocationID", "DOLocationID", "pickup_hour"])["historical_speed_kmh"]
+        .median()
+        .reset_index()
+    )
+    table = np.full((NUM_ZONES, NUM_ZONES, NUM_HOURS), np.nan, dtype=np.float32)
+    table[
+        medians["PULocationID"].to_numpy(),
+        medians["DOLocationID"].to_numpy(),
+        medians["pickup_hour"].to_numpy(),
+    ] = medians["historical_speed_kmh"].to_numpy()
+    return table
+
+
+def save_table(table: np.ndarray, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(path, table)
+    print(f"Saved table {table.shape} to {path}")
+
+
+def load_zone_tables(
+        distance_path: Path = DISTANCE_TABLE_PATH,
+        speed_path: Path = SPEED_TABLE_PATH,
+        mmap: bool = False) -> ZoneTables:
+    mmap_mode = "r" if mmap else None
+    return ZoneTables(np.load(distance_path, mmap_mode=mmap_mode), np.load(speed_path, mmap_mode=mmap_mode))
+
+
+if __name__ == "__main__":
+    from src.dispatch.resources import DISTANCE_PATH, SPEED_PATH, SPEED_URL, download_speed_data
+
+    save_table(build_distance_table(pd.read_parquet(DISTANCE_PATH)), DISTANCE_TABLE_PATH)
+
+    if not SPEED_PATH.exists():
+        download_speed_data(SPEED_PATH, SPEED_URL)
+    speed_df = pd.read_parquet(SPEED_PATH, columns=["PULocationID", "DOLocationID", "pickup_hour", "historical_speed_kmh"])
+    save_table(build_speed_table(speed_df), SPEED_TABLE_PATH)
@@ -1,7 +1,49 @@
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from sklearn.model_selection import KFold
 from typing import List
 
+AGG_FUNCS = ("median", "mean")
+
+
+def factorize_groups(df: pd.DataFrame, group_cols: List[str]) -> np.ndarray:
+    """Dense integer code per row for the combination of group_cols; -1 if any key is missing."""
+    codes = np.zeros(len(df), dtype=np.int64)
+    missing = np.zeros(len(df), dtype=bool)
+    for col in group_cols:
+        col_codes, uniques = pd.factorize(df[col], sort=False)
+        missing |= col_codes < 0
+        codes = codes * max(len(uniques), 1) + col_codes
+        # Re-compact after every column so the combined code never overflows.
+        codes = pd.factorize(codes, sort=False)[0]
+    codes[missing] = -1
+    return codes
+
+
+def _fold_stats(sorted_codes, sorted_values, sorted_folds, fold, n_groups, agg_func):
+    """Per-group statistic over every row outside ``fold``; NaN for empty groups."""
+    train = sorted_folds != fold
+    train_codes = sorted_codes[train]
+    train_values = sorted_values[train]
+    counts = np.bincount(train_codes, minlength=n_groups)
+    stats = np.full(n_groups, np.nan)
+    present = counts > 0
+
+    if agg_func == "mean":
+        sums = np.bincount(train_codes, weights=train_values, minlength=n_groups)
+        stats[present] = sums[present] / counts[present]
+    else:
+        # Rows are sorted by (group, value), so a subset keeps that order and
+        # each group's median sits at fixed offsets from its start.
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[present]
+        counts = counts[present]
+        lower = train_values[starts + (counts - 1) // 2]
+        upper = train_values[starts + counts // 2]
+        stats[present] = (lower + upper) / 2
+    return stats
+
+
 def target_encode_kfold(
         df: pd.DataFrame,
         group_cols: List[str],
@@ -9,24 +51,53 @@ def target_encode_kfold(
         k: int = 5,
         agg_func = "median",
         seed: int = 42,
-        default_value: float = None) -> pd.Series:
-    df = df.copy()
-    encoded = pd.Series(index = df.index, dtype="float64")
+        default_value: float = None,
+        n_jobs: int = 1) -> pd.Series:
+    """Out-of-fold group statistic of target_col for every row.
+
+    Each row gets the median (or mean) of target_col over rows in the same
+    group from the other k-1 folds. Groups are factorized and rows sorted
+    once; every fold is then a masked pass over flat arrays. Rows with no
+    training rows in their group get default_value (the global statistic
+    by default). Folds run on n_jobs threads.
+    """
+    if agg_func not in AGG_FUNCS:
+        raise ValueError(f"agg_func must be one of {AGG_FUNCS}, got {agg_func!r}")
+
+    n_rows = len(df)
+    codes = factorize_groups(df, group_cols)
+    values = df[target_col].to_numpy(dtype=np.float64, na_value=np.nan)
+    n_groups = int(codes.max()) + 1 if n_rows else 0
+
+    folds = np.empty(n_rows, dtype=np.int16)
     kf = KFold(n_splits=k, shuffle=True, random_state=seed)
+    for fold, (_, val_idx) in enumerate(kf.split(np.empty((n_rows, 1)))):
+        folds[val_idx] = fold
+
+    usable = (codes >= 0) & ~np.isnan(values)
+    usable_rows = np.flatnonzero(usable)
+    order = usable_rows[np.lexsort((values[usable_rows], codes[usable_rows]))]
+    sorted_codes, sorted_values, sorted_folds = codes[order], values[order], folds[order]
+    del order, usable_rows
+
+    encoded = np.full(n_rows, np.nan)
+    keyed = codes >= 0
+
+    def encode_fold(fold):
+        stats = _fold_stats(sorted_codes, sorted_values, sorted_folds, fold, n_groups, agg_func)
+        val_rows = np.flatnonzero((folds == fold) & keyed)
+        encoded[val_rows] = stats[codes[val_rows]]
+
+    if n_jobs == 1:
+        for fold in range(k):
+            encode_fold(fold)
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            list(pool.map(encode_fold, range(k)))
 
-    for train_idx, val_idx in kf.split(df):
-        train_df = df.iloc[train_idx]
-        val_df = df.iloc[val_idx]
-
-        agg = train_df.groupby(group_cols)[target_col].agg(agg_func)
-        val_encoded = val_df[group_cols].merge(
-            agg.reset_index(),
-            on=group_cols,
-            how="left"
-        )[[target_col]].set_index(val_df.index)
-    
     if default_value is None:
-        default_value = df[target_col].agg(agg_func)
-    
+        default_value = np.nanmedian(values) if agg_func == "median" else np.nanmean(values)
+
+    encoded = pd.Series(encoded, index=df.index, dtype="float64")
     encoded = encoded.fillna(default_value)
-    return encoded
\ No newline at end of file
+    return encoded
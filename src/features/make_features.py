@@ -1,7 +1,17 @@
+import hashlib
+import json
+import re
+import shutil
 import pandas as pd
+import pyarrow.dataset as ds
 from pathlib import Path
+from typing import List
+from src.data.load_and_clean import resolve_inputs
 from src.features.encode_speed import target_encode_kfold
 
+MANIFEST_NAME = "_manifest.json"
+GROUP_COLS = ["PULocationID", "DOLocationID", "pickup_hour"]
+
 def load_clean_data(path: Path) -> pd.DataFrame:
     df = pd.read_parquet(path)
     print("Loaded clean data", df.shape)
@@ -41,24 +51,158 @@ def save_features(df: pd.DataFrame, path: Path) -> None:
     print(f"Saved features to {path}")
 
 
-if __name__ == "__main__":
-    raw_path = Path("data/processed/yellow_tripdata_2025-06-cleaned.parquet")
-    distance_path = Path("data/geo/zone_distance_matrix.parquet")
-    output_path = Path("data/processed/features_yellow_tripdata_2025-06.parquet")
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def month_key(path: Path) -> str:
+    """Partition key for a cleaned monthly file, e.g. '2025-06'."""
+    match = re.search(r"(\d{4}-\d{2})", path.name)
+    return match.group(1) if match else path.stem
+
+def load_manifest(output_dir: Path) -> dict:
+    path = output_dir / MANIFEST_NAME
+    if not path.exists():
+        return {"partitions": {}}
+    with open(path) as f:
+        return json.load(f)
+
+def save_manifest(manifest: dict, output_dir: Path) -> None:
+    tmp_path = output_dir / (MANIFEST_NAME + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    tmp_path.replace(output_dir / MANIFEST_NAME)
 
-    df_trips = load_clean_data(raw_path)
-    df_distances = load_distance_matrix(distance_path)
+def partition_stages(clean_path: Path, clean_hash: str, distance_path: Path, distance_hash: str, params: dict) -> dict:
+    """Inputs and parameters of every stage that produces one month partition."""
+    return {
+        "join_features": {
+            "inputs": {str(clean_path): clean_hash, str(distance_path): distance_hash},
+        },
+        "compute_actual_speed": {},
+        "add_time_features": {},
+        "target_encode": {
+            "params": {
+                "group_cols": GROUP_COLS,
+                "target_col": "actual_speed_kmh",
+                "k": params["k"],
+                "agg_func": params["agg_func"],
+                "seed": params["seed"],
+            },
+        },
+        "write_partition": {"params": {"partition_by_hour": params["partition_by_hour"]}},
+    }
+
+def build_month_features(df_trips: pd.DataFrame, df_distances: pd.DataFrame, k: int, agg_func: str, seed: int) -> pd.DataFrame:
     df_features = join_features(df_trips, df_distances)
     df_features = compute_actual_speed(df_features)
     df_features = add_time_features(df_features)
-    group_cols = ["PULocationID", "DOLocationID", "pickup_hour"]
     df_features["historical_speed_kmh"] = target_encode_kfold(
         df=df_features,
-        group_cols=group_cols,
+        group_cols=GROUP_COLS,
         target_col="actual_speed_kmh",
-        k=5,
-        agg_func="median"
+        k=k,
+        agg_func=agg_func,
+        seed=seed,
     )
     print("✅ historical_speed_kmh added via leakage-free encoding")
+    return df_features
+
+def write_partition(df: pd.DataFrame, output_dir: Path, month: str, partition_by_hour: bool) -> List[str]:
+    """Replace the month=<month> partition; files are written aside and swapped in."""
+    final_dir = output_dir / f"month={month}"
+    tmp_dir = output_dir / f".month={month}.tmp"
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+
+    files = []
+    if partition_by_hour:
+        for hour, part in df.groupby("pickup_hour"):
+            path = tmp_dir / f"hour={hour:02d}" / "part-0.parquet"
+            save_features(part, path)
+            files.append(str(path.relative_to(tmp_dir)))
+    else:
+        save_features(df, tmp_dir / "part-0.parquet")
+        files.append("part-0.parquet")
+
+    if final_dir.exists():
+        shutil.rmtree(final_dir)
+    tmp_dir.rename(final_dir)
+    return [str(Path(final_dir.name) / f) for f in files]
+
+def build_features(
+        clean_inputs,
+        distance_path: Path,
+        output_dir: Path,
+        partition_by_hour: bool = False,
+        k: int = 5,
+        agg_func: str = "median",
+        seed: int = 42,
+        force: bool = False) -> List[str]:
+    """Incrementally build Hive-partitioned features, one partition per month.
+
+    A month is rebuilt only when the hash of its cleaned input, the distance
+    matrix or any stage parameter differs from the manifest, or when its
+    files are missing. Returns the months that were rebuilt.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    params = {"k": k, "agg_func": agg_func, "seed": seed, "partition_by_hour": partition_by_hour}
+    distance_hash = file_sha256(distance_path)
+    df_distances = None
+    rebuilt = []
+
+    for clean_path in resolve_inputs(clean_inputs):
+        month = month_key(clean_path)
+        stages = partition_stages(clean_path, file_sha256(clean_path), distance_path, distance_hash, params)
+        previous = manifest["partitions"].get(month)
+        up_to_date = (
+            previous is not None
+            and previous["stages"] == stages
+            and all((output_dir / f).exists() for f in previous["files"])
+        )
+        if up_to_date and not force:
+            print(f"⏭️  {month} is up to date")
+            continue
+
+        print(f"▶️ Building features for {month}")
+        if df_distances is None:
+            df_distances = load_distance_matrix(distance_path)
+        df_features = build_month_features(load_clean_data(clean_path), df_distances, k, agg_func, seed)
+        files = write_partition(df_features, output_dir, month, partition_by_hour)
+
+        manifest["partitions"][month] = {"stages": stages, "files": files, "rows": len(df_features)}
+        save_manifest(manifest, output_dir)
+        rebuilt.append(month)
+
+    return rebuilt
+
+def read_feature_partitions(
+        output_dir: Path,
+        months: List[str] = None,
+        hours: List[int] = None,
+        columns: List[str] = None) -> pd.DataFrame:
+    """Read only the requested month (and hour) partitions and columns."""
+    dataset = ds.dataset(output_dir, format="parquet", partitioning="hive", exclude_invalid_files=True)
+    condition = None
+    if months is not None:
+        condition = ds.field("month").isin([str(m) for m in months])
+    if hours is not None:
+        # Hour-partitioned output prunes whole files; otherwise filter rows.
+        hour_field = "hour" if "hour" in dataset.schema.names else "pickup_hour"
+        hour_condition = ds.field(hour_field).isin(list(hours))
+        condition = hour_condition if condition is None else condition & hour_condition
+    table = dataset.to_table(columns=columns, filter=condition)
+    return table.to_pandas()
+
+
+if __name__ == "__main__":
+    clean_inputs = "data/processed/yellow_tripdata_*-cleaned.parquet"
+    distance_path = Path("data/geo/zone_distance_matrix.parquet")
+    output_dir = Path("data/processed/features")
 
-    save_features(df_features, output_path)
\ No newline at end of file
+    rebuilt = build_features(clean_inputs, distance_path, output_dir)
+    print(f"Rebuilt partitions: {rebuilt or 'none'}")
@@ -0,0 +1,236 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import xgboost as xgb
+
+from src.dispatch.predictors import FEATURE_COLUMNS
+from src.dispatch.resources import MODEL_PATH
+
+FEATURES_DIR = Path("data/processed/features")
+METRICS_PATH = Path("models/xgb_eta_metrics.json")
+MLFLOW_URI = "file:./mlruns"
+TIME_COL = "tpep_pickup_datetime"
+TARGET_COL = "eta_sec"
+DEFAULT_PARAMS = {
+    "objective": "reg:squarederror",
+    "tree_method": "hist",
+    "max_depth": 6,
+    "learning_rate": 0.3,
+    "max_bin": 256,
+    "nthread": os.cpu_count(),
+}
+
+
+def feature_dataset(features_dir: Path, months: List[str] = None):
+    """The Hive-partitioned feature dataset and a row filter for the requested months."""
+    dataset = ds.dataset(features_dir, format="parquet", partitioning="hive", exclude_invalid_files=True)
+    condition = ds.field("month").isin([str(m) for m in months]) if months is not None else None
+    return dataset, condition
+
+
+def latest_pickup(dataset, condition) -> datetime:
+    latest = None
+    for batch in dataset.to_batches(columns=[TIME_COL], filter=condition):
+        batch_max = pc.max(batch.column(TIME_COL)).as_py()
+        if batch_max is not None and (latest is None or batch_max > latest):
+            latest = batch_max
+    if latest is None:
+        raise ValueError("No feature rows match the requested months")
+    return latest
+
+
+def batch_features(batch: pa.RecordBatch):
+    """Model inputs (in FEATURE_COLUMNS order) and log1p(eta_sec) target for one batch."""
+    X = batch.select(FEATURE_COLUMNS).to_pandas()
+    y = np.log1p(batch.column(TARGET_COL).to_numpy(zero_copy_only=False))
+    return X, y
+
+
+class FeatureBatchIter(xgb.DataIter):
+    """Streams feature record batches into XGBoost one at a time.
+
+    With ExtMemQuantileDMatrix the quantised pages are cached under
+    ``cache_prefix`` on disk, so memory is bounded by ``batch_size`` rather
+    than by the number of months read.
+    """
+
+    def __init__(self, dataset, condition, batch_size: int, cache_prefix: str):
+        self.dataset = dataset
+        self.condition = condition
+        self.batch_size = batch_size
+        self.rows = 0
+        self._batches = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def reset(self) -> None:
+        self._batches = self.dataset.to_batches(
+            columns=FEATURE_COLUMNS + [TARGET_COL], filter=self.condition, batch_size=self.batch_size
+        )
+        self.rows = 0
+
+    def next(self, input_data) -> bool:
+        for batch in self._batches:
+            if batch.num_rows:
+                X, y = batch_features(batch)
+                input_data(data=X, label=y)
+                self.rows += batch.num_rows
+                return True
+        return False
+
+
+def evaluate(booster: xgb.Booster, dataset, condition, batch_size: int) -> dict:
+    """Validation metrics in seconds and log space, accumulated batch by batch."""
+    n, abs_err, abs_pct_err, sq_log_err = 0, 0.0, 0.0, 0.0
+    for batch in dataset.to_batches(columns=FEATURE_COLUMNS + [TARGET_COL], filter=condition, batch_size=batch_size):
+        if not batch.num_rows:
+            continue
+        X, y = batch_features(batch)
+        pred = booster.inplace_predict(X)
+        eta_true, eta_pred = np.expm1(y), np.expm1(pred)
+        n += len(y)
+        abs_err += np.abs(eta_pred - eta_true).sum()
+        abs_pct_err += (np.abs(eta_pred - eta_true) / eta_true).sum()
+        sq_log_err += np.square(pred - y).sum()
+    if n == 0:
+        return {"rows": 0}
+    return {
+        "rows": n,
+        "mae_sec": abs_err / n,
+        "mape": abs_pct_err / n,
+        "rmse_log": float(np.sqrt(sq_log_err / n)),
+    }
+
+
+def log_to_mlflow(tracking_uri: str, params: dict, report: dict, model_path: Path, metrics_path: Path) -> None:
+    if tracking_uri.startswith("file:"):
+        # MLflow 3 refuses local file stores unless explicitly allowed.
+        os.environ.setdefault("MLFLOW_ALLOW_FILE_STORE", "true")
+    import mlflow
+
+    mlflow.set_tracking_uri(tracking_uri)
+    mlflow.set_experiment("eta-dispatch")
+    with mlflow.start_run():
+        mlflow.log_params({**params, "months": ",".join(report["months"] or ["all"]), "valid_start": report["valid_start"]})
+        mlflow.log_metrics({f"valid_{k}": v for k, v in report["valid"].items()})
+        mlflow.log_metric("train_seconds", report["train_seconds"])
+        mlflow.log_artifact(str(model_path))
+        mlflow.log_artifact(str(metrics_path))
+
+
+def train_model(
+        features_dir: Path = FEATURES_DIR,
+        months: List[str] = None,
+        valid_days: float = 7.0,
+        num_boost_round: int = 100,
+        early_stopping_rounds: int = None,
+        params: dict = None,
+        batch_size: int = 1_000_000,
+        model_path: Path = MODEL_PATH,
+        metrics_path: Path = METRICS_PATH,
+        cache_dir: Path = None,
+        mlflow_uri: str = None) -> dict:
+    """Train the ETA model out of core on one or many months of feature partitions.
+
+    The last ``valid_days`` of pickups are held out for validation, so the
+    model is always scored on trips later than those it was fitted on.
+    Writes the model JSON and a metrics JSON; returns the metrics.
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    dataset, condition = feature_dataset(features_dir, months)
+    valid_start = latest_pickup(dataset, condition) - timedelta(days=valid_days)
+    is_valid = ds.field(TIME_COL) >= pa.scalar(valid_start, type=pa.timestamp("us"))
+    train_condition = ~is_valid if condition is None else condition & ~is_valid
+    valid_condition = is_valid if condition is None else condition & is_valid
+
+    with tempfile.TemporaryDirectory(dir=cache_dir) as cache:
+        started = time.perf_counter()
+        train_iter = FeatureBatchIter(dataset, train_condition, batch_size, os.path.join(cache, "train"))
+        dtrain = xgb.ExtMemQuantileDMatrix(train_iter, max_bin=params["max_bin"], nthread=params["nthread"])
+        valid_iter = FeatureBatchIter(dataset, valid_condition, batch_size, os.path.join(cache, "valid"))
+        dvalid = xgb.ExtMemQuantileDMatrix(valid_iter, ref=dtrain, nthread=params["nthread"])
+        print(f"✅ Streamed {dtrain.num_row()} train / {dvalid.num_row()} validation rows")
+
+        evals_result = {}
+        booster = xgb.train(
+            params,
+            dtrain,
+            num_boost_round=num_boost_round,
+            evals=[(dtrain, "train"), (dvalid, "valid")],
+            early_stopping_rounds=early_stopping_rounds,
+            evals_result=evals_result,
+            verbose_eval=10,
+        )
+        train_seconds = time.perf_counter() - started
+        train_rows = dtrain.num_row()
+        del dtrain, dvalid
+
+    if early_stopping_rounds is not None:
+        booster = booster[: booster.best_iteration + 1]
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    booster.save_model(model_path)
+    print(f"✅ Saved model to {model_path}")
+
+    report = {
+        "months": months,
+        "valid_start": valid_start.isoformat(),
+        "train_rows": train_rows,
+        "num_trees": booster.num_boosted_rounds(),
+        "params": params,
+        "train_seconds": train_seconds,
+        "valid": evaluate(booster, dataset, valid_condition, batch_size),
+        "history": {name: history["rmse"] for name, history in evals_result.items()},
+    }
+    metrics_path.parent.mkdir(parents=True, exist_ok=True)
+    metrics_path.write_text(json.dumps(report, indent=2))
+    print(f"✅ Saved metrics to {metrics_path}: {report['valid']}")
+
+    if mlflow_uri is not None:
+        log_to_mlflow(mlflow_uri, params, report, model_path, metrics_path)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Train the ETA model on feature partitions with external-memory XGBoost.")
+    parser.add_argument("--features-dir", type=Path, default=FEATURES_DIR)
+    parser.add_argument("--months", nargs="+", help="YYYY-MM partitions to use (default: all)")
+    parser.add_argument("--valid-days", type=float, default=7.0, help="hold out the last N days of pickups")
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--early-stopping", type=int)
+    parser.add_argument("--max-depth", type=int, default=DEFAULT_PARAMS["max_depth"])
+    parser.add_argument("--learning-rate", type=float, default=DEFAULT_PARAMS["learning_rate"])
+    parser.add_argument("--batch-size", type=int, default=1_000_000, help="rows per streamed batch")
+    parser.add_argument("--model-out", type=Path, default=MODEL_PATH)
+    parser.add_argument("--metrics-out", type=Path, default=METRICS_PATH)
+    parser.add_argument("--cache-dir", type=Path, help="where external-memory pages are cached (default: system temp)")
+    parser.add_argument("--mlflow", nargs="?", const=MLFLOW_URI, metavar="URI",
+                        help=f"log the run to MLflow (default store: {MLFLOW_URI})")
+    args = parser.parse_args(argv)
+
+    train_model(
+        features_dir=args.features_dir,
+        months=args.months,
+        valid_days=args.valid_days,
+        num_boost_round=args.rounds,
+        early_stopping_rounds=args.early_stopping,
+        params={"max_depth": args.max_depth, "learning_rate": args.learning_rate},
+        batch_size=args.batch_size,
+        model_path=args.model_out,
+        metrics_path=args.metrics_out,
+        cache_dir=args.cache_dir,
+        mlflow_uri=args.mlflow,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,43 @@
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HTTPETAPredictor:
+    """Batch eta_predictor backed by the ETA service, over a pooled keep-alive session.
+
+    Usable directly as DispatchSimulator's eta_predictor, or through
+    ResourceConfig(predictor_backend="http", backend_options={"base_url": ...}).
+    """
+
+    def __init__(self, base_url: str = "http://localhost:8000", pool_size: int = 16, timeout: float = 5.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _post(self, path: str, payload: dict) -> dict:
+        response = self.session.post(f"{self.base_url}{path}", json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def leg_etas(self, pu_zones, do_zones, current_time) -> np.ndarray:
+        times = np.broadcast_to(current_time, np.shape(pu_zones))
+        return np.array([
+            self._post("/eta", {"pickup_zone": int(pu), "dropoff_zone": int(do), "timestamp": float(t)})["eta_sec"]
+            for pu, do, t in zip(pu_zones, do_zones, times)
+        ])
+
+    def __call__(self, order, current_time, courier_zones) -> np.ndarray:
+        payload = {
+            "pickup_zone": int(order.pickup_zone),
+            "dropoff_zone": int(order.dropoff_zone),
+            "timestamp": float(current_time),
+            "courier_zones": [int(z) for z in courier_zones],
+        }
+        return np.array(self._post("/eta/batch", payload)["etas"])
+
+    def close(self) -> None:
+        self.session.close()
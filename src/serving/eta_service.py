@@ -0,0 +1,172 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+import numpy as np
+from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field, conint
+
+from src.dispatch.resources import ResourceConfig, Resources
+
+# Seconds since SIM_START; about +/-300 years, well inside what the
+# datetime and microsecond timedelta conversions of the time features hold.
+MAX_ABS_TIMESTAMP = 1e10
+
+
+class ETARequest(BaseModel):
+    pickup_zone: int = Field(ge=0, lt=264)
+    dropoff_zone: int = Field(ge=0, lt=264)
+    timestamp: float = Field(default=0.0, allow_inf_nan=False, ge=-MAX_ABS_TIMESTAMP, le=MAX_ABS_TIMESTAMP)
+    courier_zone: Optional[int] = Field(default=None, ge=0, lt=264)
+
+
+class ETAResponse(BaseModel):
+    eta_sec: float
+
+
+class BatchETARequest(BaseModel):
+    pickup_zone: int = Field(ge=0, lt=264)
+    dropoff_zone: int = Field(ge=0, lt=264)
+    timestamp: float = Field(default=0.0, allow_inf_nan=False, ge=-MAX_ABS_TIMESTAMP, le=MAX_ABS_TIMESTAMP)
+    courier_zones: List[conint(ge=0, lt=264)]
+
+
+class BatchETAResponse(BaseModel):
+    etas: List[float]
+
+
+class MicroBatcher:
+    """Coalesces leg ETA requests that arrive within ``window_ms`` into one predictor call.
+
+    A batch is flushed when the window expires or ``max_rows`` legs are
+    waiting. The predictor runs in a worker thread so the event loop keeps
+    accepting requests while the model is busy.
+    """
+
+    def __init__(self, predict_legs, window_ms: float = 2.0, max_rows: int = 4096):
+        self.predict_legs = predict_legs
+        self.window = window_ms / 1000
+        self.max_rows = max_rows
+        self._pending = []
+        self._pending_rows = 0
+        self._timer = None
+        self._tasks = set()
+        self.stats = {"batches": 0, "requests": 0, "rows": 0}
+
+    async def submit(self, pu_zones, do_zones, times) -> np.ndarray:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((pu_zones, do_zones, times, future))
+        self._pending_rows += len(pu_zones)
+        if self._pending_rows >= self.max_rows:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_rows = self._pending, [], 0
+        if batch:
+            # The loop only keeps weak references to tasks; hold on to each
+            # one until it finishes so it cannot be garbage-collected mid-batch.
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch) -> None:
+        pu_zones = np.concatenate([b[0] for b in batch])
+        do_zones = np.concatenate([b[1] for b in batch])
+        times = np.concatenate([b[2] for b in batch])
+        self.stats["batches"] += 1
+        self.stats["requests"] += len(batch)
+        self.stats["rows"] += len(pu_zones)
+        try:
+            etas = await asyncio.to_thread(self.predict_legs, pu_zones, do_zones, times)
+        except Exception as exc:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        offset = 0
+        for pu, _, _, future in batch:
+            if not future.done():
+                future.set_result(etas[offset:offset + len(pu)])
+            offset += len(pu)
+
+
+def order_legs(pickup_zone: int, dropoff_zone: int, timestamp: float, courier_zones):
+    """Legs for one order: every courier -> pickup, then pickup -> dropoff last."""
+    courier_zones = np.asarray(courier_zones, dtype=np.int64)
+    n = len(courier_zones)
+    pu_zones = np.append(courier_zones, pickup_zone)
+    do_zones = np.append(np.full(n, pickup_zone), dropoff_zone)
+    return pu_zones, do_zones, np.full(n + 1, timestamp, dtype=np.float64)
+
+
+def create_app(config: ResourceConfig = None, window_ms: float = None, max_rows: int = 4096) -> FastAPI:
+    """ETA service; the model and lookup tables are loaded once per worker at startup."""
+    if config is None:
+        config = ResourceConfig(predictor_backend=os.environ.get("ETA_PREDICTOR_BACKEND", "xgboost"))
+    if window_ms is None:
+        window_ms = float(os.environ.get("ETA_BATCH_WINDOW_MS", "2.0"))
+    state = {}
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        resources = Resources(config)
+        predictor = resources.predictor
+        state["batcher"] = MicroBatcher(predictor.leg_etas, window_ms=window_ms, max_rows=max_rows)
+        state["started"] = time.time()
+        yield
+        state.clear()
+
+    app = FastAPI(title="ETA Dispatch", lifespan=lifespan)
+
+    @app.exception_handler(RequestValidationError)
+    async def validation_error(request: Request, exc: RequestValidationError):
+        # The default handler echoes the rejected input, and a NaN or
+        # infinite timestamp cannot be encoded as JSON.
+        errors = [{k: v for k, v in error.items() if k != "input"} for error in exc.errors()]
+        return JSONResponse(status_code=422, content={"detail": jsonable_encoder(errors)})
+
+    @app.post("/eta", response_model=ETAResponse)
+    async def eta(request: ETARequest):
+        """Trip ETA, plus the courier -> pickup leg when courier_zone is given."""
+        courier_zones = [] if request.courier_zone is None else [request.courier_zone]
+        legs = order_legs(request.pickup_zone, request.dropoff_zone, request.timestamp, courier_zones)
+        etas = await state["batcher"].submit(*legs)
+        return ETAResponse(eta_sec=float(etas.sum()))
+
+    @app.post("/eta/batch", response_model=BatchETAResponse)
+    async def eta_batch(request: BatchETARequest):
+        """Total ETA for every candidate courier zone, same as predict_eta_batch."""
+        legs = order_legs(request.pickup_zone, request.dropoff_zone, request.timestamp, request.courier_zones)
+        etas = await state["batcher"].submit(*legs)
+        return BatchETAResponse(etas=(etas[:-1] + etas[-1]).tolist())
+
+    @app.get("/healthz")
+    async def healthz():
+        return {
+            "status": "ok",
+            "backend": config.predictor_backend,
+            "uptime_sec": time.time() - state["started"],
+            "batching": state["batcher"].stats,
+        }
+
+    return app
+
+
+app = create_app()
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run("src.serving.eta_service:app", host="0.0.0.0", port=8000, workers=int(os.environ.get("WEB_CONCURRENCY", "1")))
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.model_selection import KFold
+
+from src.features.encode_speed import target_encode_kfold
+
+GROUP_COLS = ["PULocationID", "DOLocationID", "pickup_hour"]
+
+
+def naive_target_encode(df, group_cols, target_col, k=5, agg_func="median", seed=42):
+    """Reference: groupby over the training rows and merge onto the held-out fold, fold by fold."""
+    encoded = pd.Series(np.nan, index=df.index, dtype="float64")
+    kf = KFold(n_splits=k, shuffle=True, random_state=seed)
+    for train_idx, val_idx in kf.split(df):
+        train_df, val_df = df.iloc[train_idx], df.iloc[val_idx]
+        agg = train_df.groupby(group_cols)[target_col].agg(agg_func)
+        merged = val_df[group_cols].merge(agg.reset_index(), on=group_cols, how="left")
+        encoded.loc[val_df.index] = merged[target_col].to_numpy()
+    return encoded.fillna(df[target_col].agg(agg_func))
+
+
+@pytest.fixture
+def trips():
+    rng = np.random.default_rng(0)
+    n = 5000
+    df = pd.DataFrame({
+        "PULocationID": rng.integers(1, 12, n).astype("float64"),
+        "DOLocationID": rng.integers(1, 12, n),
+        "pickup_hour": rng.integers(0, 4, n),
+        "speed_kmh": rng.gamma(4.0, 5.0, n),
+    })
+    df.loc[rng.random(n) < 0.05, "speed_kmh"] = np.nan
+    df.loc[rng.random(n) < 0.02, "PULocationID"] = np.nan
+    df.index = rng.permutation(n) * 3 + 100
+    return df
+
+
+@pytest.mark.parametrize("agg_func", ["median", "mean"])
+@pytest.mark.parametrize("n_jobs", [1, 3])
+def test_matches_naive_reference(trips, agg_func, n_jobs):
+    expected = naive_target_encode(trips, GROUP_COLS, "speed_kmh", agg_func=agg_func)
+    result = target_encode_kfold(trips, GROUP_COLS, "speed_kmh", agg_func=agg_func, n_jobs=n_jobs)
+
+    assert result.index.equals(trips.index)
+    assert not result.isna().any()
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-12, atol=0)
+
+
+def test_missing_keys_get_default_value(trips):
+    result = target_encode_kfold(trips, GROUP_COLS, "speed_kmh", default_value=-1.0)
+    assert (result[trips["PULocationID"].isna()] == -1.0).all()
+
+
+def test_rejects_unknown_agg_func(trips):
+    with pytest.raises(ValueError):
+        target_encode_kfold(trips, GROUP_COLS, "speed_kmh", agg_func="max")
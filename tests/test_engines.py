@@ -0,0 +1,73 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.dispatch import resources
+from src.dispatch.columnar import Fleet
+from src.dispatch.simulator import DispatchSimulator, generate_fake_orders, initialize_couriers
+
+ZONE_IDS = list(range(1, 264))
+
+
+def toy_predictor(order, current_time, courier_zones):
+    """Deterministic total ETA with plenty of ties between couriers."""
+    courier_zones = np.asarray(courier_zones)
+    to_pickup = np.abs(courier_zones - order.pickup_zone) % 17 * 40.0
+    trip = abs(order.pickup_zone - order.dropoff_zone) % 23 * 30.0 + 120.0
+    return to_pickup + trip
+
+
+@pytest.fixture(autouse=True)
+def shared_predictor():
+    previous = resources.get_resources()
+    resources.configure(predictor=toy_predictor)
+    yield
+    resources.use_resources(previous)
+
+
+def simulate(engine, num_couriers=30, num_orders=400, interval=5.0, seed=7, fleet=False, **kwargs):
+    rng = random.Random(seed)
+    couriers = initialize_couriers(num_couriers, ZONE_IDS, rng=rng)
+    orders = generate_fake_orders(num_orders, ZONE_IDS, interval=interval, rng=rng)
+    if fleet:
+        couriers = Fleet.from_couriers(couriers)
+    sim = DispatchSimulator(couriers, orders, engine=engine, **kwargs)
+    sim.run()
+    return {
+        "assignments": list(sim.assignments),
+        "couriers": [(c.courier_id, c.current_zone, c.available_at, c.total_work_time) for c in couriers],
+        "metrics": sim.report_metrics(),
+    }
+
+
+# Most orders queue at 1 s, some at 5 s, none at 60 s.
+@pytest.mark.parametrize("interval", [1.0, 5.0, 60.0])
+def test_event_engine_matches_scan(interval):
+    scan = simulate("scan", interval=interval)
+    event = simulate("event", interval=interval)
+
+    assert event["assignments"] == scan["assignments"]
+    assert event["couriers"] == scan["couriers"]
+    assert event["metrics"] == scan["metrics"]
+
+
+@pytest.mark.parametrize("interval", [1.0, 5.0, 60.0])
+@pytest.mark.parametrize("fleet", [False, True])
+def test_columnar_engine_matches_scan(interval, fleet):
+    scan = simulate("scan", interval=interval)
+    columnar = simulate("columnar", interval=interval, fleet=fleet)
+
+    assert columnar["assignments"] == scan["assignments"]
+    assert columnar["couriers"] == scan["couriers"]
+    assert columnar["metrics"] == scan["metrics"]
+
+
+@pytest.mark.parametrize("engine, dispatch_mode", [("scan", "greedy"), ("event", "greedy"), ("event", "batch")])
+def test_object_engines_accept_a_fleet(engine, dispatch_mode):
+    expected = simulate(engine, dispatch_mode=dispatch_mode)
+    result = simulate(engine, dispatch_mode=dispatch_mode, fleet=True)
+
+    assert result["assignments"] == expected["assignments"]
+    assert result["couriers"] == expected["couriers"]
+    assert result["metrics"] == expected["metrics"]
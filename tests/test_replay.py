@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.dispatch.predictors import SIM_START
+from src.dispatch.replay import replay_orders
+
+START = pd.Timestamp("2025-06-02 07:00")
+END = pd.Timestamp("2025-06-02 10:00")
+
+
+@pytest.fixture
+def trips_path(tmp_path):
+    """600 trips an hour from 06:00 to 11:00, 2% of them to the unknown zone 264."""
+    rng = np.random.default_rng(0)
+    n = 3000
+    pickups = pd.Timestamp("2025-06-02 06:00") + pd.to_timedelta(rng.uniform(0, 5 * 3600, n), unit="s")
+    trips = pd.DataFrame({
+        "tpep_pickup_datetime": pickups.astype("datetime64[us]"),
+        "PULocationID": rng.integers(1, 264, n),
+        "DOLocationID": np.where(rng.random(n) < 0.02, 264, rng.integers(1, 264, n)),
+    })
+    path = tmp_path / "trips-cleaned.parquet"
+    trips.to_parquet(path)
+    return path
+
+
+def window_seconds():
+    return [(t - pd.Timestamp(SIM_START)).total_seconds() for t in (START, END)]
+
+
+def assert_valid(orders):
+    low, high = window_seconds()
+    assert (orders.timestamp >= low).all() and (orders.timestamp < high).all()
+    assert (np.diff(orders.timestamp) >= 0).all()
+    assert ((orders.pickup_zone >= 1) & (orders.pickup_zone < 264)).all()
+    assert ((orders.dropoff_zone >= 1) & (orders.dropoff_zone < 264)).all()
+    assert (orders.order_id == np.arange(len(orders))).all()
+
+
+def test_replays_real_trips_in_window(trips_path):
+    orders = replay_orders(trips_path, START, END)
+    trips = pd.read_parquet(trips_path)
+    in_window = trips[(trips.tpep_pickup_datetime >= START) & (trips.tpep_pickup_datetime < END) & (trips.DOLocationID < 264)]
+    assert len(orders) == len(in_window)
+    assert_valid(orders)
+
+
+@pytest.mark.parametrize("target_rate", [100.0, 1000.0, 5000.0])
+def test_target_rate_stays_in_window(trips_path, target_rate):
+    orders = replay_orders(trips_path, START, END, target_rate=target_rate, jitter_sec=900.0, seed=1)
+    assert_valid(orders)
+    expected = target_rate * 3
+    assert abs(len(orders) - expected) < 0.05 * expected
+
+
+def test_rejects_non_positive_rate(trips_path):
+    with pytest.raises(ValueError):
+        replay_orders(trips_path, START, END, target_rate=0)
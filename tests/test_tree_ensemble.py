@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.dispatch.predictors import FEATURE_COLUMNS
+from src.dispatch.resources import MODEL_PATH
+from src.dispatch.tree_ensemble import TreeEnsemble
+
+xgb = pytest.importorskip("xgboost")
+
+
+@pytest.fixture(scope="module")
+def models():
+    reference = xgb.XGBRegressor()
+    reference.load_model(MODEL_PATH)
+    return TreeEnsemble.load(MODEL_PATH), reference
+
+
+@pytest.fixture(scope="module")
+def grid():
+    """Random feature rows over (and a little beyond) the training ranges, 5% NaN."""
+    rng = np.random.default_rng(0)
+    n = 20_000
+    X = pd.DataFrame({
+        "great_circle_km": rng.uniform(0.0, 40.0, n),
+        "pickup_hour": rng.integers(0, 24, n),
+        "pickup_weekday": rng.integers(0, 7, n),
+        "is_weekend": rng.integers(0, 2, n),
+        "pickup_month": rng.integers(1, 13, n),
+        "historical_speed_kmh": rng.uniform(0.0, 80.0, n),
+    }, columns=FEATURE_COLUMNS).astype(np.float32)
+    X = X.mask(rng.random(X.shape) < 0.05)
+    return X
+
+
+def test_predict_matches_xgboost(models, grid):
+    ensemble, reference = models
+    expected = reference.predict(grid)
+    np.testing.assert_allclose(ensemble.predict(grid), expected, rtol=1e-5, atol=1e-4)
+    np.testing.assert_allclose(ensemble.predict(grid.to_numpy()), expected, rtol=1e-5, atol=1e-4)
+
+
+def test_predict_one_matches_xgboost(models, grid):
+    ensemble, reference = models
+    rows = grid.iloc[:500]
+    expected = reference.predict(rows)
+    result = np.array([ensemble.predict_one(row) for row in rows.to_numpy()])
+    np.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-4)